@@ -3,6 +3,7 @@ from flanks.client import FlanksClient
 from flanks.exceptions import (
     FlanksAPIError,
     FlanksAuthError,
+    FlanksCircuitOpenError,
     FlanksConfigError,
     FlanksError,
     FlanksNetworkError,
@@ -21,5 +22,6 @@ __all__ = [
     "FlanksValidationError",
     "FlanksNotFoundError",
     "FlanksServerError",
+    "FlanksCircuitOpenError",
     "FlanksNetworkError",
 ]
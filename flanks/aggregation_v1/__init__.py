@@ -1,6 +1,7 @@
 from flanks.aggregation_v1.client import AggregationV1Client
 from flanks.aggregation_v1.models import (
     Account,
+    AggregationBundle,
     Card,
     Currency,
     Holder,
@@ -14,6 +15,7 @@ from flanks.aggregation_v1.models import (
 __all__ = [
     "AggregationV1Client",
     "Account",
+    "AggregationBundle",
     "Card",
     "Currency",
     "Holder",
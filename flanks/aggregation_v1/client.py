@@ -1,7 +1,12 @@
-from typing import Any
+import asyncio
+import re
+from typing import Any, TypeVar, cast
+
+from pydantic import BaseModel
 
 from flanks.aggregation_v1.models import (
     Account,
+    AggregationBundle,
     Card,
     Holder,
     Identity,
@@ -12,6 +17,14 @@ from flanks.aggregation_v1.models import (
 )
 from flanks.base import BaseClient
 
+M = TypeVar("M", bound=BaseModel)
+
+# Empty object (or null) returned when the credential has no identity data
+_NO_IDENTITY = re.compile(rb"\s*(\{\s*\}|null)\s*")
+
+# Shared default for omitted queries; only ever serialized, never mutated
+_EMPTY_QUERY: dict[str, Any] = {}
+
 
 class AggregationV1Client(BaseClient):
     """Client for Aggregation API v1.
@@ -19,6 +32,27 @@ class AggregationV1Client(BaseClient):
     See: https://docs.flanks.io/pages/flanks-apis/aggregation-api/
     """
 
+    async def _get_list(
+        self,
+        path: str,
+        model: type[M],
+        credentials_token: str,
+        query: dict[str, Any] | None,
+        ignore_data_error: bool,
+    ) -> list[M]:
+        """Shared request shape of the query-filtered list endpoints."""
+        # Parametrized at runtime; `list[model]` is not a valid static type expression
+        list_model: type[list[M]] = cast(Any, list)[model]
+        return await self.api_call(
+            path,
+            {
+                "credentials_token": credentials_token,
+                "query": query if query is not None else _EMPTY_QUERY,
+                "ignore_data_error": ignore_data_error,
+            },
+            model=list_model,
+        )
+
     async def get_portfolios(
         self,
         credentials_token: str,
@@ -29,14 +63,8 @@ class AggregationV1Client(BaseClient):
 
         See: https://docs.flanks.io/pages/flanks-apis/aggregation-api/#get-portfolios
         """
-        return await self.api_call(
-            "/v0/bank/credentials/portfolio",
-            {
-                "credentials_token": credentials_token,
-                "query": query or {},
-                "ignore_data_error": ignore_data_error,
-            },
-            model=list[Portfolio],
+        return await self._get_list(
+            "/v0/bank/credentials/portfolio", Portfolio, credentials_token, query, ignore_data_error
         )
 
     async def get_investments(
@@ -49,14 +77,12 @@ class AggregationV1Client(BaseClient):
 
         See: https://docs.flanks.io/pages/flanks-apis/aggregation-api/#get-investments
         """
-        return await self.api_call(
+        return await self._get_list(
             "/v0/bank/credentials/investment",
-            {
-                "credentials_token": credentials_token,
-                "query": query or {},
-                "ignore_data_error": ignore_data_error,
-            },
-            model=list[Investment],
+            Investment,
+            credentials_token,
+            query,
+            ignore_data_error,
         )
 
     async def get_investment_transactions(
@@ -69,14 +95,12 @@ class AggregationV1Client(BaseClient):
 
         See: https://docs.flanks.io/pages/flanks-apis/aggregation-api/#get-investment-transactions
         """
-        return await self.api_call(
+        return await self._get_list(
             "/v0/bank/credentials/investment/transaction",
-            {
-                "credentials_token": credentials_token,
-                "query": query or {},
-                "ignore_data_error": ignore_data_error,
-            },
-            model=list[Transaction],
+            Transaction,
+            credentials_token,
+            query,
+            ignore_data_error,
         )
 
     async def get_accounts(
@@ -89,14 +113,8 @@ class AggregationV1Client(BaseClient):
 
         See: https://docs.flanks.io/pages/flanks-apis/aggregation-api/#get-accounts
         """
-        return await self.api_call(
-            "/v0/bank/credentials/account",
-            {
-                "credentials_token": credentials_token,
-                "query": query or {},
-                "ignore_data_error": ignore_data_error,
-            },
-            model=list[Account],
+        return await self._get_list(
+            "/v0/bank/credentials/account", Account, credentials_token, query, ignore_data_error
         )
 
     async def get_account_transactions(
@@ -109,14 +127,8 @@ class AggregationV1Client(BaseClient):
 
         See: https://docs.flanks.io/pages/flanks-apis/aggregation-api/#get-account-transactions
         """
-        return await self.api_call(
-            "/v0/bank/credentials/data",
-            {
-                "credentials_token": credentials_token,
-                "query": query or {},
-                "ignore_data_error": ignore_data_error,
-            },
-            model=list[Transaction],
+        return await self._get_list(
+            "/v0/bank/credentials/data", Transaction, credentials_token, query, ignore_data_error
         )
 
     async def get_liabilities(
@@ -129,14 +141,8 @@ class AggregationV1Client(BaseClient):
 
         See: https://docs.flanks.io/pages/flanks-apis/aggregation-api/#get-liabilities
         """
-        return await self.api_call(
-            "/v0/bank/credentials/liability",
-            {
-                "credentials_token": credentials_token,
-                "query": query or {},
-                "ignore_data_error": ignore_data_error,
-            },
-            model=list[Liability],
+        return await self._get_list(
+            "/v0/bank/credentials/liability", Liability, credentials_token, query, ignore_data_error
         )
 
     async def get_liability_transactions(
@@ -149,14 +155,12 @@ class AggregationV1Client(BaseClient):
 
         See: https://docs.flanks.io/pages/flanks-apis/aggregation-api/#get-liability-transactions
         """
-        return await self.api_call(
+        return await self._get_list(
             "/v0/bank/credentials/liability/transaction",
-            {
-                "credentials_token": credentials_token,
-                "query": query or {},
-                "ignore_data_error": ignore_data_error,
-            },
-            model=list[Transaction],
+            Transaction,
+            credentials_token,
+            query,
+            ignore_data_error,
         )
 
     async def get_cards(
@@ -169,14 +173,8 @@ class AggregationV1Client(BaseClient):
 
         See: https://docs.flanks.io/pages/flanks-apis/aggregation-api/#get-cards
         """
-        return await self.api_call(
-            "/v0/bank/credentials/card",
-            {
-                "credentials_token": credentials_token,
-                "query": query or {},
-                "ignore_data_error": ignore_data_error,
-            },
-            model=list[Card],
+        return await self._get_list(
+            "/v0/bank/credentials/card", Card, credentials_token, query, ignore_data_error
         )
 
     async def get_card_transactions(
@@ -189,14 +187,12 @@ class AggregationV1Client(BaseClient):
 
         See: https://docs.flanks.io/pages/flanks-apis/aggregation-api/#get-card-transactions
         """
-        return await self.api_call(
+        return await self._get_list(
             "/v0/bank/credentials/card/transaction",
-            {
-                "credentials_token": credentials_token,
-                "query": query or {},
-                "ignore_data_error": ignore_data_error,
-            },
-            model=list[Transaction],
+            Transaction,
+            credentials_token,
+            query,
+            ignore_data_error,
         )
 
     async def get_identity(
@@ -210,16 +206,16 @@ class AggregationV1Client(BaseClient):
 
         See: https://docs.flanks.io/pages/flanks-apis/aggregation-api/#get-identity
         """
-        response = await self.transport.api_call(
+        raw = await self.transport.api_call_raw(
             "/v0/bank/credentials/auth/",
             {
                 "credentials_token": credentials_token,
                 "ignore_data_error": ignore_data_error,
             },
         )
-        if not isinstance(response, dict):
-            raise TypeError(f"Expected dict response, got {type(response)}")
-        return Identity.model_validate(response) if response else None
+        if _NO_IDENTITY.fullmatch(raw):
+            return None
+        return Identity.model_validate_json(raw)
 
     async def get_holders(
         self,
@@ -238,3 +234,70 @@ class AggregationV1Client(BaseClient):
             },
             model=list[Holder],
         )
+
+    async def fetch_bundle(
+        self,
+        credentials_token: str,
+        ignore_data_error: bool = False,
+    ) -> AggregationBundle:
+        """Fetch every aggregation endpoint for a credential concurrently.
+
+        The requests share the client's connection pool, so total latency is
+        roughly that of the slowest endpoint rather than the sum of all of them.
+        """
+        token, ignore = credentials_token, ignore_data_error
+        portfolios = asyncio.create_task(self.get_portfolios(token, ignore_data_error=ignore))
+        investments = asyncio.create_task(self.get_investments(token, ignore_data_error=ignore))
+        investment_transactions = asyncio.create_task(
+            self.get_investment_transactions(token, ignore_data_error=ignore)
+        )
+        accounts = asyncio.create_task(self.get_accounts(token, ignore_data_error=ignore))
+        account_transactions = asyncio.create_task(
+            self.get_account_transactions(token, ignore_data_error=ignore)
+        )
+        liabilities = asyncio.create_task(self.get_liabilities(token, ignore_data_error=ignore))
+        liability_transactions = asyncio.create_task(
+            self.get_liability_transactions(token, ignore_data_error=ignore)
+        )
+        cards = asyncio.create_task(self.get_cards(token, ignore_data_error=ignore))
+        card_transactions = asyncio.create_task(
+            self.get_card_transactions(token, ignore_data_error=ignore)
+        )
+        identity = asyncio.create_task(self.get_identity(token, ignore_data_error=ignore))
+        holders = asyncio.create_task(self.get_holders(token, ignore_data_error=ignore))
+
+        tasks: list[asyncio.Task[Any]] = [
+            portfolios,
+            investments,
+            investment_transactions,
+            accounts,
+            account_transactions,
+            liabilities,
+            liability_transactions,
+            cards,
+            card_transactions,
+            identity,
+            holders,
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            # One endpoint failed (or we were cancelled): don't leave the rest running
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+        return AggregationBundle(
+            portfolios=portfolios.result(),
+            investments=investments.result(),
+            investment_transactions=investment_transactions.result(),
+            accounts=accounts.result(),
+            account_transactions=account_transactions.result(),
+            liabilities=liabilities.result(),
+            liability_transactions=liability_transactions.result(),
+            cards=cards.result(),
+            card_transactions=card_transactions.result(),
+            identity=identity.result(),
+            holders=holders.result(),
+        )
@@ -105,3 +105,21 @@ class Holder(BaseModel):
     name: str | None = None
     document_type: str | None = None
     document_number: str | None = None
+
+
+class AggregationBundle(BaseModel):
+    """All aggregated data for one credential, as returned by `fetch_bundle`."""
+
+    model_config = ConfigDict(frozen=True)
+
+    portfolios: list[Portfolio]
+    investments: list[Investment]
+    investment_transactions: list[Transaction]
+    accounts: list[Account]
+    account_transactions: list[Transaction]
+    liabilities: list[Liability]
+    liability_transactions: list[Transaction]
+    cards: list[Card]
+    card_transactions: list[Transaction]
+    identity: Identity | None
+    holders: list[Holder]
@@ -1,7 +1,8 @@
-from collections.abc import AsyncIterator
+import contextlib
+from collections.abc import AsyncGenerator
 
 from flanks.aggregation_v2.models import Product, ProductQuery, Transaction, TransactionQuery
-from flanks.base import BaseClient
+from flanks.base import BaseClient, dump_query
 from flanks.pagination import PagedResponse
 
 
@@ -14,17 +15,20 @@ class AggregationV2Client(BaseClient):
     async def list_products(
         self,
         query: ProductQuery | None = None,
-    ) -> AsyncIterator[Product]:
+    ) -> AsyncGenerator[Product, None]:
         """Iterate over all products matching query.
 
         See: https://docs.flanks.io/pages/flanks-apis/aggregation-api/v2/#list-products
         """
-        async for product in self.iterate_paged(
-            "/aggregation/v2/list-products",
-            {"query": query.model_dump(exclude_none=True) if query else {}},
-            Product,
-        ):
-            yield product
+        async with contextlib.aclosing(
+            self.iterate_paged(
+                "/aggregation/v2/list-products",
+                {"query": dump_query(query)},
+                Product,
+            )
+        ) as products:
+            async for product in products:
+                yield product
 
     async def list_products_page(
         self,
@@ -38,7 +42,7 @@ class AggregationV2Client(BaseClient):
         return await self.api_call_paged(
             "/aggregation/v2/list-products",
             {
-                "query": query.model_dump(exclude_none=True) if query else {},
+                "query": dump_query(query),
                 "page_token": page_token,
             },
             model=Product,
@@ -60,17 +64,20 @@ class AggregationV2Client(BaseClient):
     async def list_transactions(
         self,
         query: TransactionQuery | None = None,
-    ) -> AsyncIterator[Transaction]:
+    ) -> AsyncGenerator[Transaction, None]:
         """Iterate over all transactions matching query.
 
         See: https://docs.flanks.io/pages/flanks-apis/aggregation-api/v2/#list-transactions
         """
-        async for transaction in self.iterate_paged(
-            "/aggregation/v2/list-transactions",
-            {"query": query.model_dump(exclude_none=True, mode="json") if query else {}},
-            Transaction,
-        ):
-            yield transaction
+        async with contextlib.aclosing(
+            self.iterate_paged(
+                "/aggregation/v2/list-transactions",
+                {"query": dump_query(query)},
+                Transaction,
+            )
+        ) as transactions:
+            async for transaction in transactions:
+                yield transaction
 
     async def list_transactions_page(
         self,
@@ -84,7 +91,7 @@ class AggregationV2Client(BaseClient):
         return await self.api_call_paged(
             "/aggregation/v2/list-transactions",
             {
-                "query": query.model_dump(exclude_none=True, mode="json") if query else {},
+                "query": dump_query(query),
                 "page_token": page_token,
             },
             model=Transaction,
@@ -4,6 +4,8 @@ from enum import Enum
 
 from pydantic import BaseModel, ConfigDict
 
+from flanks.query import BaseQuery
+
 
 class ProductType(str, Enum):
     """Product type in Aggregation v2."""
@@ -29,7 +31,7 @@ class Product(BaseModel):
     labels: dict[str, str] | None = None
 
 
-class ProductQuery(BaseModel):
+class ProductQuery(BaseQuery):
     """Query parameters for listing products."""
 
     model_config = ConfigDict(extra="ignore")
@@ -54,7 +56,7 @@ class Transaction(BaseModel):
     labels: dict[str, str] | None = None
 
 
-class TransactionQuery(BaseModel):
+class TransactionQuery(BaseQuery):
     """Query parameters for listing transactions."""
 
     model_config = ConfigDict(extra="ignore")
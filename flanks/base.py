@@ -1,14 +1,49 @@
-from collections.abc import AsyncIterator
-from typing import Any, TypeVar, cast, get_args, get_origin, overload
+import asyncio
+import contextlib
+from collections.abc import AsyncGenerator, Callable, Sequence
+from functools import cache
+from typing import Any, Generic, TypeVar, cast, get_origin, overload
 
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
 
 from flanks.connection import FlanksConnection
 from flanks.pagination import PagedResponse
+from flanks.query import BaseQuery
 
 T = TypeVar("T", bound=BaseModel)
 
 
+def dump_query(query: BaseQuery | None) -> dict[str, Any]:
+    """Request payload for an optional query filter."""
+    return query.payload if query is not None else {}
+
+
+class _Page(BaseModel, Generic[T]):
+    """Wire envelope of token-paginated endpoints."""
+
+    items: list[T]
+    next_page_token: str | None = None
+
+
+@cache
+def _json_validator(model: Any) -> Callable[[bytes], Any]:
+    """Resolve (once per model) the validator for a raw JSON response.
+
+    `list[Model]` gets a TypeAdapter so the whole list is validated in pydantic-core.
+    """
+    if get_origin(model) is list:
+        return TypeAdapter(model).validate_json
+    return cast(type[BaseModel], model).model_validate_json
+
+
+@cache
+def _page_validator(model: type[T]) -> Callable[[bytes], _Page[T]]:
+    """Resolve (once per model) the validator for a raw paginated response."""
+    # Parametrized at runtime; `_Page[model]` is not a valid static type expression
+    page_model: type[_Page[T]] = cast(Any, _Page)[model]
+    return page_model.model_validate_json
+
+
 class BaseClient:
     """Base class for all API sub-clients."""
 
@@ -56,17 +91,22 @@ class BaseClient:
             model: Pydantic model to validate response.
                 Use `Model` for dict responses, `list[Model]` for list responses.
         """
-        result = await self.transport.api_call(path, body, method, params)
-
-        if get_origin(model) is list:
-            inner_model = get_args(model)[0]
-            if not isinstance(result, list):
-                raise TypeError(f"Expected list response, got {type(result)}")
-            return [inner_model.model_validate(item) for item in result]
+        raw = await self.transport.api_call_raw(path, body, method, params)
+        result: T | list[T] = _json_validator(model)(raw)
+        return result
 
-        if not isinstance(result, dict):
+    async def api_call_dict(
+        self,
+        path: str,
+        body: dict[str, Any] | None = None,
+        method: str = "POST",
+        params: dict[str, Any] | None = None,
+    ) -> dict[str, Any]:
+        """Execute API call for endpoints returning a JSON object without a model."""
+        result = await self.transport.api_call(path, body, method, params)
+        if type(result) is not dict:
             raise TypeError(f"Expected dict response, got {type(result)}")
-        return cast(type[T], model).model_validate(result)
+        return result
 
     async def api_call_paged(
         self,
@@ -82,28 +122,100 @@ class BaseClient:
             body: JSON body (should include page_token if paginating)
             model: Pydantic model for items in the response
         """
-        response = await self.transport.api_call(path, body)
-        if not isinstance(response, dict):
-            raise TypeError(f"Expected dict response, got {type(response)}")
-        return PagedResponse(
-            items=[model.model_validate(item) for item in response["items"]],
-            next_page_token=response.get("next_page_token"),
-        )
+        raw = await self.transport.api_call_raw(path, body)
+        page = _page_validator(model)(raw)
+        return PagedResponse(items=page.items, next_page_token=page.next_page_token)
 
     async def iterate_paged(
         self,
         path: str,
         body: dict[str, Any],
         model: type[T],
-    ) -> AsyncIterator[T]:
-        """Iterate over all items from a paginated endpoint."""
-        page_token: str | None = None
-        while True:
-            result = await self.api_call_paged(
-                path, {**body, "page_token": page_token}, model=model
-            )
-            for item in result.items:
-                yield item
-            if not result.next_page_token:
-                break
-            page_token = result.next_page_token
+    ) -> AsyncGenerator[T, None]:
+        """Iterate over all items from a paginated endpoint.
+
+        The next page is requested as soon as its token is known, so fetching it
+        overlaps with the caller consuming the current page.
+        """
+        # One payload reused for every page: each request is serialized when sent
+        # and has finished before the token is updated for the next one.
+        payload = {**body, "page_token": None}
+        result = await self.api_call_paged(path, payload, model=model)
+        next_page: asyncio.Task[PagedResponse[T]] | None = None
+        try:
+            while True:
+                if result.next_page_token:
+                    payload["page_token"] = result.next_page_token
+                    next_page = asyncio.create_task(self.api_call_paged(path, payload, model=model))
+                for item in result.items:
+                    yield item
+                if next_page is None:
+                    break
+                result = await next_page
+                next_page = None
+        finally:
+            if next_page is not None:
+                # Consumer stopped early: drop the in-flight prefetch
+                next_page.cancel()
+                await asyncio.gather(next_page, return_exceptions=True)
+
+    async def iterate_paged_many(
+        self,
+        path: str,
+        bodies: Sequence[dict[str, Any]],
+        model: type[T],
+        *,
+        prefetch: int = 8,
+        buffer: int = 100,
+    ) -> AsyncGenerator[T, None]:
+        """Iterate over several independent queries to a paginated endpoint.
+
+        Up to `prefetch` queries run concurrently, the next one starting as an
+        earlier one finishes. Items are yielded as they arrive, not in the order
+        of `bodies`; at most `buffer` of them wait for the consumer, so queries
+        pause instead of accumulating their whole results in memory.
+        """
+        if prefetch < 1:
+            raise ValueError(f"prefetch must be at least 1, got {prefetch}")
+        if buffer < 1:
+            raise ValueError(f"buffer must be at least 1, got {buffer}")
+        # Producers send items, None when their query is exhausted, or their error
+        queue: asyncio.Queue[T | Exception | None] = asyncio.Queue(maxsize=buffer)
+
+        async def produce(body: dict[str, Any]) -> None:
+            try:
+                # Closing the query's iterator cancels its prefetch if we're cancelled
+                async with contextlib.aclosing(self.iterate_paged(path, body, model)) as items:
+                    async for item in items:
+                        await queue.put(item)
+            except Exception as e:
+                await queue.put(e)
+            else:
+                await queue.put(None)
+
+        pending = iter(bodies)
+        tasks: set[asyncio.Task[None]] = set()
+
+        def start_next() -> int:
+            body = next(pending, None)
+            if body is None:
+                return 0
+            task = asyncio.create_task(produce(body))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+            return 1
+
+        running = sum(start_next() for _ in range(prefetch))
+        try:
+            while running:
+                item = await queue.get()
+                if item is None:
+                    running += start_next() - 1
+                elif isinstance(item, Exception):
+                    raise item
+                else:
+                    yield item
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
@@ -1,6 +1,8 @@
 import os
 from datetime import date
-from functools import cached_property
+from functools import cached_property, lru_cache
+
+import httpx
 
 from flanks.aggregation_v1.client import AggregationV1Client
 from flanks.aggregation_v2.client import AggregationV2Client
@@ -13,6 +15,11 @@ from flanks.links.client import LinksClient
 from flanks.report.client import ReportClient
 
 
+@lru_cache(maxsize=16)
+def _parse_version(version: str) -> date:
+    return date.fromisoformat(version)
+
+
 class FlanksClient:
     """Flanks API client with sub-clients for each API domain."""
 
@@ -28,6 +35,14 @@ class FlanksClient:
         timeout: float = 60.0,
         retries: int = 1,
         retry_backoff: float = 1.0,
+        retry_cap: float = 30.0,
+        pool_size: int = 100,
+        http2: bool = False,
+        breaker_threshold: int = 0,
+        breaker_cooldown: float = 10.0,
+        max_concurrency: int | None = None,
+        http_transport: httpx.AsyncBaseTransport | None = None,
+        cache_ttl: float = 0.0,
         version: str = "2026-01-01",
     ) -> None:
         resolved_client_id = client_id or os.environ.get("FLANKS_CLIENT_ID")
@@ -46,7 +61,15 @@ class FlanksClient:
         self._timeout = timeout
         self._retries = retries
         self._retry_backoff = retry_backoff
-        self._version = date.fromisoformat(version)
+        self._retry_cap = retry_cap
+        self._pool_size = pool_size
+        self._http2 = http2
+        self._breaker_threshold = breaker_threshold
+        self._breaker_cooldown = breaker_cooldown
+        self._max_concurrency = max_concurrency
+        self._http_transport = http_transport
+        self._cache_ttl = cache_ttl
+        self._version = _parse_version(version)
 
     @cached_property
     def transport(self) -> FlanksConnection:
@@ -58,6 +81,14 @@ class FlanksClient:
             timeout=self._timeout,
             retries=self._retries,
             retry_backoff=self._retry_backoff,
+            retry_cap=self._retry_cap,
+            pool_size=self._pool_size,
+            http2=self._http2,
+            breaker_threshold=self._breaker_threshold,
+            breaker_cooldown=self._breaker_cooldown,
+            max_concurrency=self._max_concurrency,
+            http_transport=self._http_transport,
+            cache_ttl=self._cache_ttl,
         )
 
     @cached_property
@@ -102,6 +133,10 @@ class FlanksClient:
         """Client for Report API (beta)."""
         return ReportClient(self.transport)
 
+    async def warmup(self) -> None:
+        """Authenticate and open a connection before the first API call (best-effort)."""
+        await self.transport.warmup()
+
     async def close(self) -> None:
         """Close the client and release resources."""
         if "transport" in self.__dict__:
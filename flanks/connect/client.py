@@ -1,11 +1,20 @@
-from collections.abc import AsyncIterator
+import contextlib
+from collections.abc import AsyncGenerator
 from typing import Any
 
-from flanks.base import BaseClient
+from pydantic import BaseModel
+
+from flanks.base import BaseClient, dump_query
 from flanks.connect.models import Connector, Session, SessionConfig, SessionQuery
 from flanks.pagination import PagedResponse
 
 
+class _SessionEnvelope(BaseModel):
+    """Wire envelope of the create-session endpoint."""
+
+    session: Session
+
+
 class ConnectClient(BaseClient):
     """Client for Connect API v2.
 
@@ -15,17 +24,20 @@ class ConnectClient(BaseClient):
     async def list_sessions(
         self,
         query: SessionQuery | None = None,
-    ) -> AsyncIterator[Session]:
+    ) -> AsyncGenerator[Session, None]:
         """Iterate over all sessions matching query.
 
         See: https://docs.flanks.io/pages/flanks-apis/connect-api/v2/#list-sessions
         """
-        async for session in self.iterate_paged(
-            "/connect/v2/sessions/list-sessions",
-            {"query": query.model_dump(exclude_none=True) if query else {}},
-            Session,
-        ):
-            yield session
+        async with contextlib.aclosing(
+            self.iterate_paged(
+                "/connect/v2/sessions/list-sessions",
+                {"query": dump_query(query)},
+                Session,
+            )
+        ) as sessions:
+            async for session in sessions:
+                yield session
 
     async def list_sessions_page(
         self,
@@ -39,7 +51,7 @@ class ConnectClient(BaseClient):
         return await self.api_call_paged(
             "/connect/v2/sessions/list-sessions",
             {
-                "query": query.model_dump(exclude_none=True) if query else {},
+                "query": dump_query(query),
                 "page_token": page_token,
             },
             model=Session,
@@ -50,26 +62,28 @@ class ConnectClient(BaseClient):
 
         See: https://docs.flanks.io/pages/flanks-apis/connect-api/v2/#create-session
         """
-        response = await self.transport.api_call(
+        response = await self.api_call(
             "/connect/v2/sessions/create-session",
             {"configuration": config.model_dump()},
+            model=_SessionEnvelope,
         )
-        if not isinstance(response, dict):
-            raise TypeError(f"Expected dict response, got {type(response)}")
-        return Session.model_validate(response["session"])
+        return response.session
 
     async def list_connectors(
         self,
         connector_ids: list[str] | None = None,
-    ) -> AsyncIterator[Connector]:
+    ) -> AsyncGenerator[Connector, None]:
         """Iterate over available connectors.
 
         See: https://docs.flanks.io/pages/flanks-apis/connect-api/v2/#list-connectors
         """
         query: dict[str, Any] = {"connector_id_in": connector_ids} if connector_ids else {}
-        async for connector in self.iterate_paged(
-            "/connect/v2/connectors/list-connectors",
-            {"query": query},
-            Connector,
-        ):
-            yield connector
+        async with contextlib.aclosing(
+            self.iterate_paged(
+                "/connect/v2/connectors/list-connectors",
+                {"query": query},
+                Connector,
+            )
+        ) as connectors:
+            async for connector in connectors:
+                yield connector
@@ -2,6 +2,8 @@ from enum import Enum
 
 from pydantic import BaseModel, ConfigDict
 
+from flanks.query import BaseQuery
+
 
 class SessionStatus(str, Enum):
     WAITING_CREDENTIALS = "Waiting:ProvideCredentials"
@@ -31,7 +33,7 @@ class Session(BaseModel):
     error_code: SessionErrorCode | None = None
 
 
-class SessionQuery(BaseModel):
+class SessionQuery(BaseQuery):
     """Query parameters for listing sessions."""
 
     model_config = ConfigDict(extra="ignore")
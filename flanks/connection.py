@@ -1,22 +1,64 @@
 import asyncio
+import contextlib
+import random
 import time
-from functools import cached_property
+from dataclasses import dataclass
 from typing import Any
 
 import httpx
+from pydantic_core import from_json, to_json
 
 from flanks.exceptions import (
+    FlanksAPIError,
     FlanksAuthError,
+    FlanksCircuitOpenError,
     FlanksNetworkError,
     FlanksNotFoundError,
     FlanksServerError,
     FlanksValidationError,
 )
 
+# The token endpoint answers quickly; don't let a stuck refresh hold every caller
+# for the full request timeout
+TOKEN_TIMEOUT = 5.0
+
+_JSON_CONTENT_TYPE = {"Content-Type": "application/json"}
+
+# Client errors with a dedicated exception; 5xx is handled as FlanksServerError
+_STATUS_ERRORS: dict[int, tuple[type[FlanksAPIError], str]] = {
+    400: (FlanksValidationError, "Validation error"),
+    401: (FlanksAuthError, "Invalid or expired token"),
+    404: (FlanksNotFoundError, "Resource not found"),
+}
+
+
+def _retry_after(response: httpx.Response) -> float | None:
+    """Seconds from a Retry-After header; HTTP-date values are ignored."""
+    value = response.headers.get("Retry-After")
+    if value is None:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        return None
+
+
+@dataclass(slots=True)
+class _Circuit:
+    """Circuit breaker state of one API path."""
+
+    failures: int = 0
+    opened_at: float | None = None
+    probing: bool = False
+
 
 class FlanksConnection:
     """Internal HTTP transport handling auth and requests."""
 
+    _token: str | None
+    _auth_headers: dict[str, str]
+    _json_headers: dict[str, str]
+
     def __init__(
         self,
         client_id: str,
@@ -25,6 +67,14 @@ class FlanksConnection:
         timeout: float = 60.0,
         retries: int = 1,
         retry_backoff: float = 1.0,
+        retry_cap: float = 30.0,
+        pool_size: int = 100,
+        http2: bool = False,
+        breaker_threshold: int = 0,
+        breaker_cooldown: float = 10.0,
+        max_concurrency: int | None = None,
+        http_transport: httpx.AsyncBaseTransport | None = None,
+        cache_ttl: float = 0.0,
     ) -> None:
         self._client_id = client_id
         self._client_secret = client_secret
@@ -32,49 +82,239 @@ class FlanksConnection:
         self._timeout = timeout
         self._retries = retries
         self._retry_backoff = retry_backoff
+        self._retry_cap = retry_cap
+        self._pool_size = pool_size
+        self._http2 = http2
+        self._breaker_threshold = breaker_threshold
+        self._breaker_cooldown = breaker_cooldown
+        # Replaces httpx's connection pool (pool_size and http2 then don't apply)
+        self._http_transport = http_transport
 
-        self._access_token: str | None = None
+        self._token_body = to_json(
+            {
+                "client_id": client_id,
+                "client_secret": client_secret,
+                "grant_type": "client_credentials",
+            }
+        )
+        self._access_token = None
+        # Deadline on the monotonic clock, immune to wall-clock adjustments
         self._token_expires_at: float = 0
+        self._token_issued_at: float | None = None
+        self._background_refresh: asyncio.Task[None] | None = None
+        self._refresh_lock = asyncio.Lock()
+
+        self._urls: dict[str, httpx.URL] = {}
+        # Excess requests wait here rather than for a pool slot, where httpx's
+        # pool timeout would fail them under heavy fan-out
+        self._max_concurrency = max_concurrency or pool_size
+        self._gate = asyncio.Semaphore(self._max_concurrency)
 
-    @cached_property
+        # Opt-in: GET responses are served from memory for `cache_ttl` seconds
+        self._cache_ttl = cache_ttl
+        self._get_cache: dict[tuple[str, str], tuple[float, bytes]] = {}
+
+        self._http_client: httpx.AsyncClient | None = None
+        self._http_loop: asyncio.AbstractEventLoop | None = None
+
+        # Breaker state per API path, so one failing endpoint doesn't block the rest
+        self._circuits: dict[str, _Circuit] = {}
+
+    @property
+    def _access_token(self) -> str | None:
+        return self._token
+
+    @_access_token.setter
+    def _access_token(self, token: str | None) -> None:
+        # Build the auth header once per token instead of once per request
+        self._token = token
+        self._auth_headers = {"Authorization": f"Bearer {token}"}
+        self._json_headers = {**self._auth_headers, "Content-Type": "application/json"}
+
+    @property
     def _http(self) -> httpx.AsyncClient:
-        return httpx.AsyncClient(
-            base_url=self._base_url,
-            timeout=self._timeout,
-        )
+        """Single long-lived HTTP client; its pool is shared by all concurrent calls."""
+        return self._bind_loop()
+
+    def _bind_loop(self) -> httpx.AsyncClient:
+        """Return the HTTP client for the running event loop, creating it if needed.
+
+        Pooled connections belong to the event loop that opened them, so a new
+        client (with its concurrency gate and refresh lock) is created when used
+        from another loop, e.g. across separate `asyncio.run()` calls, and the
+        stale one is retired.
+        """
+        try:
+            loop: asyncio.AbstractEventLoop | None = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+
+        if loop is not None and self._http_loop is not None and loop is not self._http_loop:
+            self._retire_client()
+        if self._http_client is None:
+            self._http_client = httpx.AsyncClient(
+                base_url=self._base_url,
+                timeout=self._timeout,
+                limits=httpx.Limits(
+                    max_connections=self._pool_size,
+                    max_keepalive_connections=self._pool_size,
+                    keepalive_expiry=30.0,
+                ),
+                http2=self._http2,
+                transport=self._http_transport,
+            )
+            self._gate = asyncio.Semaphore(self._max_concurrency)
+            self._refresh_lock = asyncio.Lock()
+            self._http_loop = loop
+        elif self._http_loop is None:
+            self._http_loop = loop
+        return self._http_client
+
+    def _retire_client(self) -> None:
+        """Drop the client bound to another event loop, closing it on that loop.
+
+        Its connections can only be closed from the loop that opened them, so the
+        close is scheduled there; a loop that is already closed took them down.
+        """
+        client, loop = self._http_client, self._http_loop
+        self._http_client = None
+        self._http_loop = None
+        if client is None or loop is None or loop.is_closed():
+            return
+        loop.call_soon_threadsafe(lambda: loop.create_task(client.aclose()))
+
+    def _url(self, path: str) -> httpx.URL:
+        """Absolute URL for an API path, joined once so httpx skips merging it per request."""
+        url = self._urls.get(path)
+        if url is None:
+            url = httpx.URL(f"{self._base_url.rstrip('/')}/{path.lstrip('/')}")
+            if len(self._urls) < 256:  # Bound the cache for ad-hoc transport paths
+                self._urls[path] = url
+        return url
 
     async def _refresh_token(self) -> None:
-        """Fetch new access token via client credentials flow."""
-        response = await self._http.post(
-            "/v0/token",
-            json={
-                "client_id": self._client_id,
-                "client_secret": self._client_secret,
-                "grant_type": "client_credentials",
-            },
-        )
+        """Fetch new access token via client credentials flow.
+
+        Server and network errors are retried with the same jittered backoff as
+        API calls, since every later request depends on the token.
+        """
+        http = self._http
+        for attempt in range(self._retries + 1):
+            try:
+                response = await http.post(
+                    "/v0/token",
+                    content=self._token_body,
+                    headers=_JSON_CONTENT_TYPE,
+                    timeout=min(self._timeout, TOKEN_TIMEOUT),
+                )
+            except httpx.TransportError:
+                if attempt == self._retries:
+                    raise
+            else:
+                if response.status_code < 500 or attempt == self._retries:
+                    break
+            await asyncio.sleep(self._backoff(attempt))
 
         if response.status_code == 403:
             raise FlanksAuthError(
                 "Invalid client credentials",
                 status_code=403,
-                response_body=response.json(),
+                raw_body=response.content,
             )
 
         response.raise_for_status()
 
-        data = response.json()
+        data = from_json(response.content)
         self._access_token = data["access_token"]
-        self._token_expires_at = time.time() + data["expires_in"]
+        self._token_issued_at = time.monotonic()
+        self._token_expires_at = self._token_issued_at + data["expires_in"]
 
-    async def _ensure_token(self) -> None:
-        """Proactive refresh if token expires within 5 minutes."""
-        if time.time() > self._token_expires_at - 300:
+    async def _renew_token(self, rejected: str | None) -> bool:
+        """Replace a token the API rejected, once for all callers that saw it.
+
+        Concurrent requests failing with the same stale token queue on the lock;
+        the first refreshes and the rest find the token already rotated. Returns
+        False when the rejected token was issued less than a second ago: a fresh
+        token being refused points at the credentials, and minting another one
+        for every failing call would only add a token round trip to each.
+        """
+        async with self._refresh_lock:
+            if self._access_token != rejected:
+                return True
+            if self._token_issued_at is not None and time.monotonic() - self._token_issued_at < 1.0:
+                return False
             await self._refresh_token()
+            return True
+
+    async def _ensure_token(self) -> None:
+        """Make sure a usable token is available.
+
+        Within 5 minutes of expiry the token is refreshed in the background while
+        the current one keeps being used; only a missing or (nearly) expired token
+        blocks the caller on the refresh.
+        """
+        now = time.monotonic()
+        if now <= self._token_expires_at - 300:
+            return  # Common case: token comfortably valid
+        if now > self._token_expires_at - 30:
+            self._bind_loop()
+            async with self._refresh_lock:
+                # Callers queued behind the first find the token already refreshed
+                if time.monotonic() > self._token_expires_at - 30:
+                    await self._refresh_token()
+        elif self._background_refresh is None or self._background_refresh.done():
+            self._background_refresh = asyncio.create_task(self._refresh_token_quietly())
+
+    async def _refresh_token_quietly(self) -> None:
+        """Background refresh; on failure the next blocking refresh raises instead.
+
+        Any error is swallowed, including a malformed token response, since
+        nothing awaits this task to receive it.
+        """
+        self._bind_loop()
+        with contextlib.suppress(Exception):
+            async with self._refresh_lock:
+                # A blocking refresh may have renewed the token while this one waited
+                if time.monotonic() > self._token_expires_at - 300:
+                    await self._refresh_token()
+
+    async def warmup(self) -> None:
+        """Fetch a token ahead of the first call, opening a pooled connection.
+
+        Best-effort: network failures and error responses from the token endpoint
+        are ignored and will surface on the first real request instead. Rejected
+        client credentials still raise `FlanksAuthError`.
+        """
+        with contextlib.suppress(httpx.HTTPError, FlanksServerError):
+            await self._ensure_token()
 
     async def close(self) -> None:
-        """Close underlying HTTP client."""
-        await self._http.aclose()
+        """Close underlying HTTP client; a later call opens a new one.
+
+        Cached GET responses and circuit breaker state are dropped with it, so a
+        reopened connection starts from a clean session.
+        """
+        self._get_cache.clear()
+        self._circuits.clear()
+        if self._background_refresh is not None:
+            self._background_refresh.cancel()
+            await asyncio.gather(self._background_refresh, return_exceptions=True)
+            self._background_refresh = None
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
+            self._http_loop = None
+
+    async def __aenter__(self) -> "FlanksConnection":
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: object,
+    ) -> None:
+        await self.close()
 
     async def api_call(
         self,
@@ -91,72 +331,168 @@ class FlanksConnection:
             method: HTTP method (GET, POST, PUT, DELETE)
             params: Query parameters for GET requests
         """
+        result: dict[str, Any] | list[Any] = from_json(
+            await self.api_call_raw(path, body, method, params)
+        )
+        return result
+
+    async def api_call_raw(
+        self,
+        path: str,
+        body: dict[str, Any] | None = None,
+        method: str = "POST",
+        params: dict[str, Any] | None = None,
+    ) -> bytes:
+        """Execute API call like `api_call`, returning the undecoded response body.
+
+        Lets callers hand the JSON straight to pydantic (`model_validate_json`)
+        instead of decoding it into Python objects first.
+        """
+        cache_key: tuple[str, str] | None = None
+        if method == "GET" and self._cache_ttl > 0:
+            cache_key = (path, str(httpx.QueryParams(params)) if params else "")
+            cached = self._get_cache.get(cache_key)
+            if cached is not None and cached[0] > time.monotonic():
+                return cached[1]
+
         await self._ensure_token()
+        # Encode once with pydantic-core (not httpx's stdlib-json `json=` path);
+        # retries and the post-refresh replay resend the same bytes
+        content = to_json(body) if body is not None and method != "GET" else None
+
+        self._admit(path)
+        try:
+            result = await self._send(method, path, content, params)
+        except (FlanksServerError, FlanksNetworkError):
+            self._record_failure(path)
+            raise
+        except BaseException:
+            self._release_probe(path)
+            raise
+        if self._circuits:
+            self._circuits.pop(path, None)  # Success closes the path's circuit
 
-        last_error: Exception | None = None
+        if cache_key is not None:
+            self._cache_response(cache_key, result)
+        return result
+
+    async def _send(
+        self,
+        method: str,
+        path: str,
+        content: bytes | None,
+        params: dict[str, Any] | None,
+    ) -> bytes:
+        """Send a request, retrying server errors and replaying once after a 401."""
+        last_error: FlanksServerError | None = None
         for attempt in range(self._retries + 1):
+            token = self._access_token
             try:
-                return await self._execute(method, path, body, params)
+                return await self._execute(method, path, content, params)
             except FlanksServerError as e:
                 last_error = e
                 if attempt < self._retries:
-                    await asyncio.sleep(self._retry_backoff * (2**attempt))
+                    await asyncio.sleep(self._backoff(attempt, e.retry_after))
             except FlanksAuthError:
                 # Token might have been revoked - refresh and retry once
-                await self._refresh_token()
-                try:
-                    return await self._execute(method, path, body, params)
-                except FlanksAuthError:
+                if not await self._renew_token(token):
                     raise
+                return await self._execute(method, path, content, params)
 
         if last_error is not None:
             raise last_error
 
         raise RuntimeError("Unexpected state: no result and no error")
 
+    def _cache_response(self, key: tuple[str, str], body: bytes) -> None:
+        """Store a GET response body, keeping the cache to 128 entries."""
+        now = time.monotonic()
+        if len(self._get_cache) >= 128 and key not in self._get_cache:
+            for stale in [k for k, (expires, _) in self._get_cache.items() if expires <= now]:
+                del self._get_cache[stale]
+            if len(self._get_cache) >= 128:
+                del self._get_cache[next(iter(self._get_cache))]  # Oldest entry
+        self._get_cache[key] = (now + self._cache_ttl, body)
+
+    def _backoff(self, attempt: int, retry_after: float | None = None) -> float:
+        """Delay before retry number `attempt` (0-based).
+
+        Full jitter keeps concurrent callers from retrying in lockstep; the window
+        doubles per attempt up to `retry_cap`. A server-sent Retry-After is honoured
+        as a floor, but still capped so a bad header can't stall the caller.
+        """
+        delay = random.uniform(0, min(self._retry_cap, self._retry_backoff * (2**attempt)))
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self._retry_cap))
+        return delay
+
+    def _admit(self, path: str) -> None:
+        """Fail fast while the path's circuit is open.
+
+        Once the cooldown has passed a single caller is let through as a probe;
+        the others keep failing fast until its outcome closes or reopens the circuit.
+        """
+        circuit = self._circuits.get(path)
+        if circuit is None or circuit.opened_at is None:
+            return
+        if circuit.probing or time.monotonic() - circuit.opened_at < self._breaker_cooldown:
+            raise FlanksCircuitOpenError(
+                f"Circuit open for {path} after {circuit.failures} consecutive failures"
+            )
+        circuit.probing = True
+
+    def _record_failure(self, path: str) -> None:
+        """Count a call that failed with server or network errors after all retries."""
+        if not self._breaker_threshold:
+            return
+        circuit = self._circuits.get(path)
+        if circuit is None:
+            circuit = self._circuits[path] = _Circuit()
+        circuit.failures += 1
+        circuit.probing = False
+        if circuit.failures >= self._breaker_threshold:
+            circuit.opened_at = time.monotonic()
+
+    def _release_probe(self, path: str) -> None:
+        """Let another caller probe after one that ended without a verdict (e.g. a 4xx)."""
+        circuit = self._circuits.get(path)
+        if circuit is not None:
+            circuit.probing = False
+
     async def _execute(
         self,
         method: str,
         path: str,
-        body: dict[str, Any] | None,
+        content: bytes | None,
         params: dict[str, Any] | None = None,
-    ) -> dict[str, Any] | list[Any]:
-        """Execute a single HTTP request."""
+    ) -> bytes:
+        """Execute a single HTTP request with a pre-encoded JSON body."""
+        http = self._http  # Binds the client and gate to the running loop
         try:
-            response = await self._http.request(
-                method=method,
-                url=path,
-                json=body if method != "GET" else None,
-                params=params,
-                headers={"Authorization": f"Bearer {self._access_token}"},
-            )
+            async with self._gate:
+                response = await http.request(
+                    method=method,
+                    url=self._url(path),
+                    content=content,
+                    params=params,
+                    headers=self._json_headers if content is not None else self._auth_headers,
+                )
         except httpx.HTTPError as e:
             raise FlanksNetworkError(str(e), cause=e) from e
 
-        if response.status_code == 401:
-            raise FlanksAuthError(
-                "Invalid or expired token",
-                status_code=401,
-                response_body=response.json(),
-            )
-        if response.status_code == 400:
-            raise FlanksValidationError(
-                "Validation error",
-                status_code=400,
-                response_body=response.json(),
-            )
-        if response.status_code == 404:
-            raise FlanksNotFoundError(
-                "Resource not found",
-                status_code=404,
-                response_body=response.json(),
-            )
-        if response.status_code >= 500:
+        status = response.status_code
+        if status < 400:
+            return response.content
+        if status >= 500:
             raise FlanksServerError(
                 "Server error",
-                status_code=response.status_code,
-                response_body=response.json(),
+                status_code=status,
+                raw_body=response.content,
+                retry_after=_retry_after(response),
             )
+        error = _STATUS_ERRORS.get(status)
+        if error is not None:
+            error_class, message = error
+            raise error_class(message, status_code=status, raw_body=response.content)
 
-        result: dict[str, Any] | list[Any] = response.json()
-        return result
+        return response.content
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 import builtins
 
 from flanks.base import BaseClient
@@ -36,19 +37,36 @@ class CredentialsClient(BaseClient):
             model=CredentialsListResponse,
         )
 
-    async def list_all(self) -> builtins.list[Credential]:
+    async def list_all(self, concurrency: int = 8) -> builtins.list[Credential]:
         """List all credentials across all pages.
 
+        The first page reports the page count, so the remaining pages are fetched
+        concurrently, at most `concurrency` at a time. If a page fails, the pages
+        still pending are cancelled before the error is raised.
+
         See: https://docs.flanks.io/pages/flanks-apis/credentials-api/#list-credentials
         """
-        all_credentials: builtins.list[Credential] = []
-        page = 1
-        while True:
-            response = await self.list(page)
+        if concurrency < 1:
+            raise ValueError(f"concurrency must be at least 1, got {concurrency}")
+        first = await self.list(1)
+        gate = asyncio.Semaphore(concurrency)
+
+        async def fetch(page: int) -> CredentialsListResponse:
+            async with gate:
+                return await self.list(page)
+
+        tasks = [asyncio.create_task(fetch(page)) for page in range(2, first.pages + 1)]
+        try:
+            rest = await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+        all_credentials = builtins.list(first.items)
+        for response in rest:
             all_credentials.extend(response.items)
-            if page >= response.pages:
-                break
-            page += 1
         return all_credentials
 
     async def force_sca(self, credentials_token: str) -> str:
@@ -58,13 +76,11 @@ class CredentialsClient(BaseClient):
 
         See: https://docs.flanks.io/pages/flanks-apis/credentials-api/#force-sca-reset-or-transactions-token
         """
-        response = await self.transport.api_call(
+        response = await self.api_call_dict(
             "/v0/bank/credentials/status",
             {"credentials_token": credentials_token, "force": "sca"},
             method="PUT",
         )
-        if not isinstance(response, dict):
-            raise TypeError(f"Expected dict response, got {type(response)}")
         return str(response["sca_token"])
 
     async def force_reset(self, credentials_token: str) -> str:
@@ -74,13 +90,11 @@ class CredentialsClient(BaseClient):
 
         See: https://docs.flanks.io/pages/flanks-apis/credentials-api/#force-sca-reset-or-transactions-token
         """
-        response = await self.transport.api_call(
+        response = await self.api_call_dict(
             "/v0/bank/credentials/status",
             {"credentials_token": credentials_token, "force": "reset"},
             method="PUT",
         )
-        if not isinstance(response, dict):
-            raise TypeError(f"Expected dict response, got {type(response)}")
         return str(response["reset_token"])
 
     async def force_transaction(self, credentials_token: str) -> str:
@@ -90,13 +104,11 @@ class CredentialsClient(BaseClient):
 
         See: https://docs.flanks.io/pages/flanks-apis/credentials-api/#force-sca-reset-or-transactions-token
         """
-        response = await self.transport.api_call(
+        response = await self.api_call_dict(
             "/v0/bank/credentials/status",
             {"credentials_token": credentials_token, "force": "transaction"},
             method="PUT",
         )
-        if not isinstance(response, dict):
-            raise TypeError(f"Expected dict response, got {type(response)}")
         return str(response["transaction_token"])
 
     async def delete(self, credentials_token: str) -> None:
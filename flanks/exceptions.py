@@ -1,5 +1,7 @@
 from typing import Any
 
+from pydantic_core import from_json
+
 
 class FlanksError(Exception):
     """Base exception for all Flanks SDK errors."""
@@ -21,10 +23,34 @@ class FlanksAPIError(FlanksError):
         message: str,
         status_code: int | None = None,
         response_body: dict[str, Any] | None = None,
+        *,
+        raw_body: bytes | None = None,
     ) -> None:
         super().__init__(message)
         self.status_code = status_code
-        self.response_body = response_body
+        self._response_body = response_body
+        # Undecoded error body; most callers only log the error, so it's parsed on demand
+        self._raw_body = raw_body
+
+    @property
+    def response_body(self) -> dict[str, Any] | None:
+        """Decoded JSON error body, or None if the error carries no body.
+
+        A body that isn't a JSON object (e.g. an HTML error page) reads as `{}`.
+        """
+        if self._raw_body is not None:
+            try:
+                body = from_json(self._raw_body)
+            except ValueError:
+                body = None
+            self._response_body = body if isinstance(body, dict) else {}
+            self._raw_body = None
+        return self._response_body
+
+    @response_body.setter
+    def response_body(self, value: dict[str, Any] | None) -> None:
+        self._response_body = value
+        self._raw_body = None
 
 
 class FlanksAuthError(FlanksAPIError):
@@ -48,6 +74,22 @@ class FlanksNotFoundError(FlanksAPIError):
 class FlanksServerError(FlanksAPIError):
     """5xx - Server-side error (retryable)."""
 
+    def __init__(
+        self,
+        message: str,
+        status_code: int | None = None,
+        response_body: dict[str, Any] | None = None,
+        retry_after: float | None = None,
+        *,
+        raw_body: bytes | None = None,
+    ) -> None:
+        super().__init__(message, status_code, response_body, raw_body=raw_body)
+        self.retry_after = retry_after
+
+
+class FlanksCircuitOpenError(FlanksServerError):
+    """Request rejected without being sent after repeated server errors."""
+
     pass
 
 
@@ -4,7 +4,7 @@ from typing import Generic, TypeVar
 T = TypeVar("T")
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class PagedResponse(Generic[T]):
     """Container for paginated API responses."""
 
@@ -0,0 +1,21 @@
+from typing import Any
+
+from pydantic import BaseModel, ConfigDict
+
+
+class BaseQuery(BaseModel):
+    """Base for list-endpoint query filters.
+
+    The payload is serialized when a listing starts; paginated listings reuse it
+    for every page they fetch.
+    """
+
+    model_config = ConfigDict(extra="ignore")
+
+    @property
+    def payload(self) -> dict[str, Any]:
+        """JSON-ready request payload, omitting unset filters."""
+        result: dict[str, Any] = self.__pydantic_serializer__.to_python(
+            self, mode="json", exclude_none=True
+        )
+        return result
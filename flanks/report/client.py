@@ -3,10 +3,18 @@ from __future__ import annotations
 import datetime
 from typing import Any, cast
 
+from pydantic import BaseModel
+
 from flanks.base import BaseClient
 from flanks.report.models import Report, ReportTemplate
 
 
+class _TemplateList(BaseModel):
+    """Wire envelope of the list-templates endpoint."""
+
+    items: list[ReportTemplate] = []
+
+
 class ReportClient(BaseClient):
     """Client for Report API (beta).
 
@@ -18,10 +26,8 @@ class ReportClient(BaseClient):
 
         See: https://docs.flanks.io/pages/flanks-apis/report-api/#list-report-templates
         """
-        response = await self.transport.api_call("/report/v1/list-templates")
-        if not isinstance(response, dict):
-            raise TypeError(f"Expected dict response, got {type(response)}")
-        return [ReportTemplate.model_validate(item) for item in response.get("items", [])]
+        response = await self.api_call("/report/v1/list-templates", model=_TemplateList)
+        return response.items
 
     async def build_report(
         self,
@@ -78,10 +84,8 @@ class ReportClient(BaseClient):
 
         See: https://docs.flanks.io/pages/flanks-apis/report-api/#get-report-content-url
         """
-        response = await self.transport.api_call(
+        response = await self.api_call_dict(
             "/report/v1/get-report-content",
             {"report_id": report_id},
         )
-        if not isinstance(response, dict):
-            raise TypeError(f"Expected dict response, got {type(response)}")
         return cast(str, response["url"])
@@ -1,8 +1,12 @@
+import asyncio
+import json
+from decimal import Decimal
+
 import httpx
 import pytest
 import respx
 
-from flanks import FlanksClient
+from flanks import FlanksClient, FlanksNotFoundError
 from flanks.aggregation_v1.models import (
     Account,
     Card,
@@ -95,357 +99,231 @@ class TestAggregationV1Models:
         assert holder.document_type == "DNI"
 
 
-class TestAggregationV1Client:
-    @respx.mock
-    @pytest.mark.asyncio
-    async def test_get_portfolios(self) -> None:
-        respx.post("https://api.test.flanks.io/v0/token").mock(
-            return_value=httpx.Response(
-                200,
-                json={"access_token": "token", "expires_in": 3600, "token_type": "Bearer"},
-            )
-        )
-
-        respx.post("https://api.test.flanks.io/v0/bank/credentials/portfolio").mock(
-            return_value=httpx.Response(
-                200,
-                json=[{"portfolio_id": "p1", "name": "Portfolio 1"}],
-            )
-        )
-
-        async with FlanksClient(
-            client_id="id",
-            client_secret="secret",
-            base_url="https://api.test.flanks.io",
-        ) as client:
-            portfolios = await client.aggregation_v1.get_portfolios("cred_token")
-
-        assert len(portfolios) == 1
-        assert portfolios[0].portfolio_id == "p1"
-
-    @respx.mock
-    @pytest.mark.asyncio
-    async def test_get_investments(self) -> None:
-        respx.post("https://api.test.flanks.io/v0/token").mock(
-            return_value=httpx.Response(
-                200,
-                json={"access_token": "token", "expires_in": 3600, "token_type": "Bearer"},
-            )
-        )
-
-        respx.post("https://api.test.flanks.io/v0/bank/credentials/investment").mock(
-            return_value=httpx.Response(
-                200,
-                json=[{"investment_id": "i1", "name": "Stock A", "isin": "US123"}],
-            )
-        )
-
-        async with FlanksClient(
-            client_id="id",
-            client_secret="secret",
-            base_url="https://api.test.flanks.io",
-        ) as client:
-            investments = await client.aggregation_v1.get_investments("cred_token")
-
-        assert len(investments) == 1
-        assert investments[0].investment_id == "i1"
-        assert investments[0].isin == "US123"
-
-    @respx.mock
-    @pytest.mark.asyncio
-    async def test_get_investment_transactions(self) -> None:
-        respx.post("https://api.test.flanks.io/v0/token").mock(
-            return_value=httpx.Response(
-                200,
-                json={"access_token": "token", "expires_in": 3600, "token_type": "Bearer"},
-            )
-        )
-
-        respx.post("https://api.test.flanks.io/v0/bank/credentials/investment/transaction").mock(
-            return_value=httpx.Response(
-                200,
-                json=[{"transaction_id": "t1", "amount": "1000.00"}],
-            )
-        )
-
-        async with FlanksClient(
-            client_id="id",
-            client_secret="secret",
-            base_url="https://api.test.flanks.io",
-        ) as client:
-            transactions = await client.aggregation_v1.get_investment_transactions("cred_token")
-
-        assert len(transactions) == 1
-        assert transactions[0].transaction_id == "t1"
-
-    @respx.mock
-    @pytest.mark.asyncio
-    async def test_get_accounts(self) -> None:
-        respx.post("https://api.test.flanks.io/v0/token").mock(
-            return_value=httpx.Response(
-                200,
-                json={"access_token": "token", "expires_in": 3600, "token_type": "Bearer"},
-            )
-        )
-
-        respx.post("https://api.test.flanks.io/v0/bank/credentials/account").mock(
-            return_value=httpx.Response(
-                200,
-                json=[{"account_id": "a1", "iban": "ES1234"}],
-            )
-        )
-
-        async with FlanksClient(
-            client_id="id",
-            client_secret="secret",
-            base_url="https://api.test.flanks.io",
-        ) as client:
-            accounts = await client.aggregation_v1.get_accounts("cred_token")
-
-        assert len(accounts) == 1
-        assert accounts[0].account_id == "a1"
-
-    @respx.mock
-    @pytest.mark.asyncio
-    async def test_get_account_transactions(self) -> None:
-        respx.post("https://api.test.flanks.io/v0/token").mock(
-            return_value=httpx.Response(
-                200,
-                json={"access_token": "token", "expires_in": 3600, "token_type": "Bearer"},
-            )
-        )
-
-        respx.post("https://api.test.flanks.io/v0/bank/credentials/data").mock(
-            return_value=httpx.Response(
-                200,
-                json=[{"transaction_id": "t1", "amount": "-50.00"}],
-            )
-        )
-
-        async with FlanksClient(
-            client_id="id",
-            client_secret="secret",
-            base_url="https://api.test.flanks.io",
-        ) as client:
-            transactions = await client.aggregation_v1.get_account_transactions("cred_token")
-
-        assert len(transactions) == 1
-        assert transactions[0].transaction_id == "t1"
-
-    @respx.mock
-    @pytest.mark.asyncio
-    async def test_get_liabilities(self) -> None:
-        respx.post("https://api.test.flanks.io/v0/token").mock(
-            return_value=httpx.Response(
-                200,
-                json={"access_token": "token", "expires_in": 3600, "token_type": "Bearer"},
-            )
-        )
-
-        respx.post("https://api.test.flanks.io/v0/bank/credentials/liability").mock(
-            return_value=httpx.Response(
-                200,
-                json=[{"liability_id": "l1", "name": "Mortgage"}],
-            )
-        )
-
-        async with FlanksClient(
-            client_id="id",
-            client_secret="secret",
-            base_url="https://api.test.flanks.io",
-        ) as client:
-            liabilities = await client.aggregation_v1.get_liabilities("cred_token")
+LIST_BODY = {"credentials_token": "cred_token", "query": {}, "ignore_data_error": False}
+HOLDERS_BODY = {"credentials_token": "cred_token", "ignore_data_error": False}
 
-        assert len(liabilities) == 1
-        assert liabilities[0].liability_id == "l1"
 
-    @respx.mock
-    @pytest.mark.asyncio
-    async def test_get_liability_transactions(self) -> None:
-        respx.post("https://api.test.flanks.io/v0/token").mock(
-            return_value=httpx.Response(
-                200,
-                json={"access_token": "token", "expires_in": 3600, "token_type": "Bearer"},
-            )
-        )
-
-        respx.post("https://api.test.flanks.io/v0/bank/credentials/liability/transaction").mock(
-            return_value=httpx.Response(
-                200,
-                json=[{"transaction_id": "t1", "amount": "-500.00"}],
-            )
-        )
-
-        async with FlanksClient(
-            client_id="id",
-            client_secret="secret",
-            base_url="https://api.test.flanks.io",
-        ) as client:
-            transactions = await client.aggregation_v1.get_liability_transactions("cred_token")
-
-        assert len(transactions) == 1
-        assert transactions[0].transaction_id == "t1"
-
-    @respx.mock
-    @pytest.mark.asyncio
-    async def test_get_cards(self) -> None:
-        respx.post("https://api.test.flanks.io/v0/token").mock(
-            return_value=httpx.Response(
-                200,
-                json={"access_token": "token", "expires_in": 3600, "token_type": "Bearer"},
-            )
-        )
-
-        respx.post("https://api.test.flanks.io/v0/bank/credentials/card").mock(
-            return_value=httpx.Response(
-                200,
-                json=[{"card_id": "c1", "masked_number": "****5678"}],
-            )
-        )
-
-        async with FlanksClient(
-            client_id="id",
-            client_secret="secret",
-            base_url="https://api.test.flanks.io",
-        ) as client:
-            cards = await client.aggregation_v1.get_cards("cred_token")
-
-        assert len(cards) == 1
-        assert cards[0].card_id == "c1"
-
-    @respx.mock
-    @pytest.mark.asyncio
-    async def test_get_card_transactions(self) -> None:
-        respx.post("https://api.test.flanks.io/v0/token").mock(
-            return_value=httpx.Response(
-                200,
-                json={"access_token": "token", "expires_in": 3600, "token_type": "Bearer"},
-            )
-        )
-
-        respx.post("https://api.test.flanks.io/v0/bank/credentials/card/transaction").mock(
-            return_value=httpx.Response(
-                200,
-                json=[{"transaction_id": "t1", "amount": "-25.00"}],
-            )
-        )
-
-        async with FlanksClient(
-            client_id="id",
-            client_secret="secret",
-            base_url="https://api.test.flanks.io",
-        ) as client:
-            transactions = await client.aggregation_v1.get_card_transactions("cred_token")
-
-        assert len(transactions) == 1
-        assert transactions[0].transaction_id == "t1"
-
-    @respx.mock
-    @pytest.mark.asyncio
-    async def test_get_identity(self) -> None:
-        respx.post("https://api.test.flanks.io/v0/token").mock(
-            return_value=httpx.Response(
-                200,
-                json={"access_token": "token", "expires_in": 3600, "token_type": "Bearer"},
-            )
-        )
-
-        respx.post("https://api.test.flanks.io/v0/bank/credentials/auth/").mock(
+class TestAggregationV1Client:
+    @pytest.mark.parametrize(
+        ("method", "path", "item", "expected", "body"),
+        [
+            (
+                "get_portfolios",
+                "portfolio",
+                {"portfolio_id": "p1", "name": "Portfolio 1"},
+                {"portfolio_id": "p1", "name": "Portfolio 1"},
+                LIST_BODY,
+            ),
+            (
+                "get_investments",
+                "investment",
+                {"investment_id": "i1", "name": "Stock A", "isin": "US123"},
+                {"investment_id": "i1", "name": "Stock A", "isin": "US123"},
+                LIST_BODY,
+            ),
+            (
+                "get_investment_transactions",
+                "investment/transaction",
+                {"transaction_id": "t1", "amount": "1000.00"},
+                {"transaction_id": "t1", "amount": Decimal("1000.00")},
+                LIST_BODY,
+            ),
+            (
+                "get_accounts",
+                "account",
+                {"account_id": "a1", "iban": "ES1234"},
+                {"account_id": "a1", "iban": "ES1234"},
+                LIST_BODY,
+            ),
+            (
+                "get_account_transactions",
+                "data",
+                {"transaction_id": "t1", "amount": "-50.00"},
+                {"transaction_id": "t1", "amount": Decimal("-50.00")},
+                LIST_BODY,
+            ),
+            (
+                "get_liabilities",
+                "liability",
+                {"liability_id": "l1", "name": "Mortgage"},
+                {"liability_id": "l1", "name": "Mortgage"},
+                LIST_BODY,
+            ),
+            (
+                "get_liability_transactions",
+                "liability/transaction",
+                {"transaction_id": "t1", "amount": "-500.00"},
+                {"transaction_id": "t1", "amount": Decimal("-500.00")},
+                LIST_BODY,
+            ),
+            (
+                "get_cards",
+                "card",
+                {"card_id": "c1", "masked_number": "****5678"},
+                {"card_id": "c1", "masked_number": "****5678"},
+                LIST_BODY,
+            ),
+            (
+                "get_card_transactions",
+                "card/transaction",
+                {"transaction_id": "t1", "amount": "-25.00"},
+                {"transaction_id": "t1", "amount": Decimal("-25.00")},
+                LIST_BODY,
+            ),
+            (
+                "get_holders",
+                "holder",
+                {"holder_id": "h1", "name": "Jane Doe"},
+                {"holder_id": "h1", "name": "Jane Doe"},
+                HOLDERS_BODY,
+            ),
+        ],
+    )
+    async def test_list_endpoints(
+        self,
+        flanks_client: FlanksClient,
+        api_mock: respx.MockRouter,
+        method: str,
+        path: str,
+        item: dict[str, str],
+        expected: dict[str, object],
+        body: dict[str, object],
+    ) -> None:
+        route = api_mock.post(f"/v0/bank/credentials/{path}").mock(
+            return_value=httpx.Response(200, json=[item])
+        )
+
+        results = await getattr(flanks_client.aggregation_v1, method)("cred_token")
+
+        assert json.loads(route.calls.last.request.content) == body
+        assert len(results) == 1
+        assert {field: getattr(results[0], field) for field in expected} == expected
+
+    async def test_get_identity(
+        self, flanks_client: FlanksClient, api_mock: respx.MockRouter
+    ) -> None:
+        api_mock.post("/v0/bank/credentials/auth/").mock(
             return_value=httpx.Response(
                 200,
                 json={"name": "John Doe", "email": "john@example.com"},
             )
         )
 
-        async with FlanksClient(
-            client_id="id",
-            client_secret="secret",
-            base_url="https://api.test.flanks.io",
-        ) as client:
-            identity = await client.aggregation_v1.get_identity("cred_token")
+        identity = await flanks_client.aggregation_v1.get_identity("cred_token")
 
         assert identity is not None
         assert identity.name == "John Doe"
 
-    @respx.mock
-    @pytest.mark.asyncio
-    async def test_get_identity_returns_none_when_empty(self) -> None:
-        respx.post("https://api.test.flanks.io/v0/token").mock(
-            return_value=httpx.Response(
-                200,
-                json={"access_token": "token", "expires_in": 3600, "token_type": "Bearer"},
-            )
-        )
-
-        respx.post("https://api.test.flanks.io/v0/bank/credentials/auth/").mock(
-            return_value=httpx.Response(200, json={})
-        )
+    async def test_get_identity_returns_none_when_empty(
+        self, flanks_client: FlanksClient, api_mock: respx.MockRouter
+    ) -> None:
+        api_mock.post("/v0/bank/credentials/auth/").mock(return_value=httpx.Response(200, json={}))
 
-        async with FlanksClient(
-            client_id="id",
-            client_secret="secret",
-            base_url="https://api.test.flanks.io",
-        ) as client:
-            identity = await client.aggregation_v1.get_identity("cred_token")
+        identity = await flanks_client.aggregation_v1.get_identity("cred_token")
 
         assert identity is None
 
-    @respx.mock
-    @pytest.mark.asyncio
-    async def test_get_holders(self) -> None:
-        respx.post("https://api.test.flanks.io/v0/token").mock(
-            return_value=httpx.Response(
-                200,
-                json={"access_token": "token", "expires_in": 3600, "token_type": "Bearer"},
-            )
-        )
-
-        respx.post("https://api.test.flanks.io/v0/bank/credentials/holder").mock(
-            return_value=httpx.Response(
-                200,
-                json=[{"holder_id": "h1", "name": "Jane Doe"}],
-            )
+    async def test_get_identity_returns_none_when_null(
+        self, flanks_client: FlanksClient, api_mock: respx.MockRouter
+    ) -> None:
+        api_mock.post("/v0/bank/credentials/auth/").mock(
+            return_value=httpx.Response(200, content=b"null")
         )
 
-        async with FlanksClient(
-            client_id="id",
-            client_secret="secret",
-            base_url="https://api.test.flanks.io",
-        ) as client:
-            holders = await client.aggregation_v1.get_holders("cred_token")
-
-        assert len(holders) == 1
-        assert holders[0].holder_id == "h1"
+        identity = await flanks_client.aggregation_v1.get_identity("cred_token")
 
-    @respx.mock
-    @pytest.mark.asyncio
-    async def test_get_portfolios_with_query(self) -> None:
-        respx.post("https://api.test.flanks.io/v0/token").mock(
-            return_value=httpx.Response(
-                200,
-                json={"access_token": "token", "expires_in": 3600, "token_type": "Bearer"},
-            )
-        )
+        assert identity is None
 
-        route = respx.post("https://api.test.flanks.io/v0/bank/credentials/portfolio").mock(
+    async def test_get_portfolios_with_query(
+        self, flanks_client: FlanksClient, api_mock: respx.MockRouter
+    ) -> None:
+        route = api_mock.post("/v0/bank/credentials/portfolio").mock(
             return_value=httpx.Response(200, json=[])
         )
 
-        async with FlanksClient(
-            client_id="id",
-            client_secret="secret",
-            base_url="https://api.test.flanks.io",
-        ) as client:
-            await client.aggregation_v1.get_portfolios(
-                "cred_token",
-                query={"portfolio_id": ["p1", "p2"]},
-                ignore_data_error=True,
-            )
+        await flanks_client.aggregation_v1.get_portfolios(
+            "cred_token",
+            query={"portfolio_id": ["p1", "p2"]},
+            ignore_data_error=True,
+        )
 
         # Verify the query structure in the request body
-        import json
-
         request_body = json.loads(route.calls.last.request.content)
         assert request_body["credentials_token"] == "cred_token"
         assert request_body["query"] == {"portfolio_id": ["p1", "p2"]}
         assert request_body["ignore_data_error"] is True
+
+    async def test_fetch_bundle(
+        self, flanks_client: FlanksClient, api_mock: respx.MockRouter
+    ) -> None:
+        base = "/v0/bank/credentials"
+        api_mock.post(f"{base}/portfolio").mock(
+            return_value=httpx.Response(200, json=[{"portfolio_id": "p1"}])
+        )
+        api_mock.post(f"{base}/investment").mock(
+            return_value=httpx.Response(200, json=[{"investment_id": "i1"}])
+        )
+        api_mock.post(f"{base}/account").mock(
+            return_value=httpx.Response(200, json=[{"account_id": "a1"}])
+        )
+        api_mock.post(f"{base}/data").mock(
+            return_value=httpx.Response(200, json=[{"transaction_id": "t1"}])
+        )
+        api_mock.post(f"{base}/liability").mock(
+            return_value=httpx.Response(200, json=[{"liability_id": "l1"}])
+        )
+        api_mock.post(f"{base}/card").mock(
+            return_value=httpx.Response(200, json=[{"card_id": "c1"}])
+        )
+        for path in ("investment/transaction", "liability/transaction", "card/transaction"):
+            api_mock.post(f"{base}/{path}").mock(return_value=httpx.Response(200, json=[]))
+        api_mock.post(f"{base}/auth/").mock(
+            return_value=httpx.Response(200, json={"name": "John Doe"})
+        )
+        api_mock.post(f"{base}/holder").mock(
+            return_value=httpx.Response(200, json=[{"holder_id": "h1"}])
+        )
+
+        bundle = await flanks_client.aggregation_v1.fetch_bundle("cred_token")
+
+        assert bundle.portfolios[0].portfolio_id == "p1"
+        assert bundle.investments[0].investment_id == "i1"
+        assert bundle.accounts[0].account_id == "a1"
+        assert bundle.account_transactions[0].transaction_id == "t1"
+        assert bundle.liabilities[0].liability_id == "l1"
+        assert bundle.cards[0].card_id == "c1"
+        assert bundle.investment_transactions == []
+        assert bundle.identity is not None
+        assert bundle.identity.name == "John Doe"
+        assert bundle.holders[0].holder_id == "h1"
+
+    async def test_fetch_bundle_cancels_pending_calls_on_error(
+        self, flanks_client: FlanksClient, base_url: str
+    ) -> None:
+        portfolios_cancelled = asyncio.Event()
+
+        async def hang(request: httpx.Request) -> httpx.Response:
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                portfolios_cancelled.set()
+                raise
+            raise AssertionError("unreachable")
+
+        def respond(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(200, json={} if request.url.path.endswith("/auth/") else [])
+
+        # The cancelled request is never recorded as a call
+        with respx.mock(base_url=base_url, assert_all_called=False) as api_mock:
+            api_mock.post("/v0/bank/credentials/portfolio").mock(side_effect=hang)
+            api_mock.post("/v0/bank/credentials/holder").mock(
+                return_value=httpx.Response(404, json={"error": "not found"})
+            )
+            api_mock.route().mock(side_effect=respond)
+
+            with pytest.raises(FlanksNotFoundError):
+                await asyncio.wait_for(
+                    flanks_client.aggregation_v1.fetch_bundle("cred_token"), timeout=1
+                )
+
+        assert portfolios_cancelled.is_set()
@@ -1,8 +1,9 @@
+import asyncio
 import datetime
+import json
 from decimal import Decimal
 
 import httpx
-import pytest
 import respx
 
 from flanks import FlanksClient
@@ -56,17 +57,10 @@ class TestAggregationV2Models:
 
 
 class TestAggregationV2Client:
-    @respx.mock
-    @pytest.mark.asyncio
-    async def test_list_products_iterator(self) -> None:
-        respx.post("https://api.test.flanks.io/v0/token").mock(
-            return_value=httpx.Response(
-                200,
-                json={"access_token": "token", "expires_in": 3600, "token_type": "Bearer"},
-            )
-        )
-
-        route = respx.post("https://api.test.flanks.io/aggregation/v2/list-products")
+    async def test_list_products_iterator(
+        self, flanks_client: FlanksClient, api_mock: respx.MockRouter
+    ) -> None:
+        route = api_mock.post("/aggregation/v2/list-products")
         route.side_effect = [
             httpx.Response(
                 200,
@@ -84,28 +78,48 @@ class TestAggregationV2Client:
             ),
         ]
 
-        async with FlanksClient(
-            client_id="id",
-            client_secret="secret",
-            base_url="https://api.test.flanks.io",
-        ) as client:
-            products = [p async for p in client.aggregation_v2.list_products()]
+        products = [p async for p in flanks_client.aggregation_v2.list_products()]
 
         assert len(products) == 2
         assert products[0].product_id == "p1"
         assert products[1].product_type == ProductType.CARD
 
-    @respx.mock
-    @pytest.mark.asyncio
-    async def test_list_products_with_query(self) -> None:
-        respx.post("https://api.test.flanks.io/v0/token").mock(
-            return_value=httpx.Response(
-                200,
-                json={"access_token": "token", "expires_in": 3600, "token_type": "Bearer"},
-            )
-        )
-
-        respx.post("https://api.test.flanks.io/aggregation/v2/list-products").mock(
+    async def test_closing_list_products_cancels_prefetch(
+        self, flanks_client: FlanksClient, api_mock: respx.MockRouter
+    ) -> None:
+        second_page_started = asyncio.Event()
+        second_page_cancelled = asyncio.Event()
+
+        async def respond(request: httpx.Request) -> httpx.Response:
+            if json.loads(request.content)["page_token"] is None:
+                return httpx.Response(
+                    200,
+                    json={
+                        "items": [{"product_id": "p1", "product_type": "Account"}],
+                        "next_page_token": "page2",
+                    },
+                )
+            second_page_started.set()
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                second_page_cancelled.set()
+                raise
+            raise AssertionError("unreachable")
+
+        api_mock.post("/aggregation/v2/list-products").mock(side_effect=respond)
+
+        products = flanks_client.aggregation_v2.list_products()
+        await anext(products)
+        await asyncio.wait_for(second_page_started.wait(), timeout=1)
+        await asyncio.wait_for(products.aclose(), timeout=1)
+
+        assert second_page_cancelled.is_set()
+
+    async def test_list_products_with_query(
+        self, flanks_client: FlanksClient, api_mock: respx.MockRouter
+    ) -> None:
+        api_mock.post("/aggregation/v2/list-products").mock(
             return_value=httpx.Response(
                 200,
                 json={
@@ -115,32 +129,18 @@ class TestAggregationV2Client:
             )
         )
 
-        async with FlanksClient(
-            client_id="id",
-            client_secret="secret",
-            base_url="https://api.test.flanks.io",
-        ) as client:
-            query = ProductQuery(product_type_in=[ProductType.ACCOUNT])
-            products = [p async for p in client.aggregation_v2.list_products(query)]
+        query = ProductQuery(product_type_in=[ProductType.ACCOUNT])
+        products = [p async for p in flanks_client.aggregation_v2.list_products(query)]
 
         assert len(products) == 1
         # Verify query was sent
-        import json
-
-        request_body = json.loads(respx.calls.last.request.content)
+        request_body = json.loads(api_mock.calls.last.request.content)
         assert request_body["query"]["product_type_in"] == ["Account"]
 
-    @respx.mock
-    @pytest.mark.asyncio
-    async def test_list_products_page(self) -> None:
-        respx.post("https://api.test.flanks.io/v0/token").mock(
-            return_value=httpx.Response(
-                200,
-                json={"access_token": "token", "expires_in": 3600, "token_type": "Bearer"},
-            )
-        )
-
-        respx.post("https://api.test.flanks.io/aggregation/v2/list-products").mock(
+    async def test_list_products_page(
+        self, flanks_client: FlanksClient, api_mock: respx.MockRouter
+    ) -> None:
+        api_mock.post("/aggregation/v2/list-products").mock(
             return_value=httpx.Response(
                 200,
                 json={
@@ -150,56 +150,30 @@ class TestAggregationV2Client:
             )
         )
 
-        async with FlanksClient(
-            client_id="id",
-            client_secret="secret",
-            base_url="https://api.test.flanks.io",
-        ) as client:
-            page = await client.aggregation_v2.list_products_page()
+        page = await flanks_client.aggregation_v2.list_products_page()
 
         assert isinstance(page, PagedResponse)
         assert len(page.items) == 1
         assert page.next_page_token == "next_token"
 
-    @respx.mock
-    @pytest.mark.asyncio
-    async def test_set_product_labels(self) -> None:
-        respx.post("https://api.test.flanks.io/v0/token").mock(
-            return_value=httpx.Response(
-                200,
-                json={"access_token": "token", "expires_in": 3600, "token_type": "Bearer"},
-            )
-        )
-
-        respx.post("https://api.test.flanks.io/aggregation/v2/set-product-labels").mock(
+    async def test_set_product_labels(
+        self, flanks_client: FlanksClient, api_mock: respx.MockRouter
+    ) -> None:
+        api_mock.post("/aggregation/v2/set-product-labels").mock(
             return_value=httpx.Response(200, json={"success": True})
         )
 
-        async with FlanksClient(
-            client_id="id",
-            client_secret="secret",
-            base_url="https://api.test.flanks.io",
-        ) as client:
-            await client.aggregation_v2.set_product_labels("prod_123", {"category": "savings"})
+        await flanks_client.aggregation_v2.set_product_labels("prod_123", {"category": "savings"})
 
         # Verify request
-        import json
-
-        request_body = json.loads(respx.calls.last.request.content)
+        request_body = json.loads(api_mock.calls.last.request.content)
         assert request_body["product_id"] == "prod_123"
         assert request_body["labels"] == {"category": "savings"}
 
-    @respx.mock
-    @pytest.mark.asyncio
-    async def test_list_transactions_iterator(self) -> None:
-        respx.post("https://api.test.flanks.io/v0/token").mock(
-            return_value=httpx.Response(
-                200,
-                json={"access_token": "token", "expires_in": 3600, "token_type": "Bearer"},
-            )
-        )
-
-        respx.post("https://api.test.flanks.io/aggregation/v2/list-transactions").mock(
+    async def test_list_transactions_iterator(
+        self, flanks_client: FlanksClient, api_mock: respx.MockRouter
+    ) -> None:
+        api_mock.post("/aggregation/v2/list-transactions").mock(
             return_value=httpx.Response(
                 200,
                 json={
@@ -209,27 +183,15 @@ class TestAggregationV2Client:
             )
         )
 
-        async with FlanksClient(
-            client_id="id",
-            client_secret="secret",
-            base_url="https://api.test.flanks.io",
-        ) as client:
-            transactions = [t async for t in client.aggregation_v2.list_transactions()]
+        transactions = [t async for t in flanks_client.aggregation_v2.list_transactions()]
 
         assert len(transactions) == 1
         assert transactions[0].transaction_id == "tx1"
 
-    @respx.mock
-    @pytest.mark.asyncio
-    async def test_list_transactions_with_query(self) -> None:
-        respx.post("https://api.test.flanks.io/v0/token").mock(
-            return_value=httpx.Response(
-                200,
-                json={"access_token": "token", "expires_in": 3600, "token_type": "Bearer"},
-            )
-        )
-
-        respx.post("https://api.test.flanks.io/aggregation/v2/list-transactions").mock(
+    async def test_list_transactions_with_query(
+        self, flanks_client: FlanksClient, api_mock: respx.MockRouter
+    ) -> None:
+        api_mock.post("/aggregation/v2/list-transactions").mock(
             return_value=httpx.Response(
                 200,
                 json={
@@ -239,51 +201,30 @@ class TestAggregationV2Client:
             )
         )
 
-        async with FlanksClient(
-            client_id="id",
-            client_secret="secret",
-            base_url="https://api.test.flanks.io",
-        ) as client:
-            query = TransactionQuery(
-                product_id_in=["prod1"],
-                date_from=datetime.date(2024, 1, 1),
-                date_to=datetime.date(2024, 12, 31),
-            )
-            transactions = [t async for t in client.aggregation_v2.list_transactions(query)]
+        query = TransactionQuery(
+            product_id_in=["prod1"],
+            date_from=datetime.date(2024, 1, 1),
+            date_to=datetime.date(2024, 12, 31),
+        )
+        transactions = [t async for t in flanks_client.aggregation_v2.list_transactions(query)]
 
         assert len(transactions) == 1
         # Verify query
-        import json
-
-        request_body = json.loads(respx.calls.last.request.content)
+        request_body = json.loads(api_mock.calls.last.request.content)
         assert request_body["query"]["product_id_in"] == ["prod1"]
         assert request_body["query"]["date_from"] == "2024-01-01"
         assert request_body["query"]["date_to"] == "2024-12-31"
 
-    @respx.mock
-    @pytest.mark.asyncio
-    async def test_set_transaction_labels(self) -> None:
-        respx.post("https://api.test.flanks.io/v0/token").mock(
-            return_value=httpx.Response(
-                200,
-                json={"access_token": "token", "expires_in": 3600, "token_type": "Bearer"},
-            )
-        )
-
-        respx.post("https://api.test.flanks.io/aggregation/v2/set-transaction-labels").mock(
+    async def test_set_transaction_labels(
+        self, flanks_client: FlanksClient, api_mock: respx.MockRouter
+    ) -> None:
+        api_mock.post("/aggregation/v2/set-transaction-labels").mock(
             return_value=httpx.Response(200, json={"success": True})
         )
 
-        async with FlanksClient(
-            client_id="id",
-            client_secret="secret",
-            base_url="https://api.test.flanks.io",
-        ) as client:
-            await client.aggregation_v2.set_transaction_labels("tx_123", {"reviewed": "true"})
+        await flanks_client.aggregation_v2.set_transaction_labels("tx_123", {"reviewed": "true"})
 
         # Verify request
-        import json
-
-        request_body = json.loads(respx.calls.last.request.content)
+        request_body = json.loads(api_mock.calls.last.request.content)
         assert request_body["transaction_id"] == "tx_123"
         assert request_body["labels"] == {"reviewed": "true"}
@@ -1,4 +1,19 @@
+from collections.abc import AsyncIterator, Iterator
+
 import pytest
+import pytest_asyncio
+import respx
+
+from flanks import FlanksClient
+from flanks.connection import FlanksConnection
+
+
+def pytest_collection_modifyitems(items: list[pytest.Item]) -> None:
+    """Run every async test on one session-wide event loop instead of a loop per test."""
+    session_loop = pytest.mark.asyncio(loop_scope="session")
+    for item in items:
+        if pytest_asyncio.is_async_test(item):
+            item.add_marker(session_loop, append=False)
 
 
 @pytest.fixture
@@ -14,3 +29,31 @@ def client_secret() -> str:
 @pytest.fixture
 def base_url() -> str:
     return "https://api.test.flanks.io"
+
+
+@pytest.fixture
+def api_mock(base_url: str) -> Iterator[respx.MockRouter]:
+    """respx router for the test API; routes take paths relative to `base_url`."""
+    with respx.mock(base_url=base_url) as router:
+        yield router
+
+
+@pytest.fixture
+async def transport(base_url: str) -> AsyncIterator[FlanksConnection]:
+    """Transport with a valid token preloaded, so tests skip the token exchange."""
+    async with FlanksConnection(client_id="id", client_secret="secret", base_url=base_url) as conn:
+        conn._access_token = "token"
+        conn._token_expires_at = 9999999999
+        yield conn
+
+
+@pytest.fixture
+async def flanks_client(base_url: str) -> AsyncIterator[FlanksClient]:
+    """Client against the respx-mocked test API, closed after the test.
+
+    Starts with a valid token so tests only need to mock the endpoint under test.
+    """
+    async with FlanksClient(client_id="id", client_secret="secret", base_url=base_url) as client:
+        client.transport._access_token = "token"
+        client.transport._token_expires_at = 9999999999
+        yield client
@@ -1,5 +1,6 @@
+import json
+
 import httpx
-import pytest
 import respx
 
 from flanks import FlanksClient
@@ -37,17 +38,10 @@ class TestSessionModel:
 
 
 class TestConnectClient:
-    @respx.mock
-    @pytest.mark.asyncio
-    async def test_list_sessions_iterator(self) -> None:
-        respx.post("https://api.test.flanks.io/v0/token").mock(
-            return_value=httpx.Response(
-                200,
-                json={"access_token": "token", "expires_in": 3600, "token_type": "Bearer"},
-            )
-        )
-
-        route = respx.post("https://api.test.flanks.io/connect/v2/sessions/list-sessions")
+    async def test_list_sessions_iterator(
+        self, flanks_client: FlanksClient, api_mock: respx.MockRouter
+    ) -> None:
+        route = api_mock.post("/connect/v2/sessions/list-sessions")
         route.side_effect = [
             httpx.Response(
                 200,
@@ -65,28 +59,16 @@ class TestConnectClient:
             ),
         ]
 
-        async with FlanksClient(
-            client_id="id",
-            client_secret="secret",
-            base_url="https://api.test.flanks.io",
-        ) as client:
-            sessions = [s async for s in client.connect.list_sessions()]
+        sessions = [s async for s in flanks_client.connect.list_sessions()]
 
         assert len(sessions) == 2
         assert sessions[0].session_id == "s1"
         assert sessions[1].status == SessionStatus.FINISHED_ERROR
 
-    @respx.mock
-    @pytest.mark.asyncio
-    async def test_list_sessions_with_query(self) -> None:
-        respx.post("https://api.test.flanks.io/v0/token").mock(
-            return_value=httpx.Response(
-                200,
-                json={"access_token": "token", "expires_in": 3600, "token_type": "Bearer"},
-            )
-        )
-
-        respx.post("https://api.test.flanks.io/connect/v2/sessions/list-sessions").mock(
+    async def test_list_sessions_with_query(
+        self, flanks_client: FlanksClient, api_mock: respx.MockRouter
+    ) -> None:
+        api_mock.post("/connect/v2/sessions/list-sessions").mock(
             return_value=httpx.Response(
                 200,
                 json={
@@ -96,32 +78,18 @@ class TestConnectClient:
             )
         )
 
-        async with FlanksClient(
-            client_id="id",
-            client_secret="secret",
-            base_url="https://api.test.flanks.io",
-        ) as client:
-            query = SessionQuery(status_in=[SessionStatus.FINISHED_OK])
-            sessions = [s async for s in client.connect.list_sessions(query)]
+        query = SessionQuery(status_in=[SessionStatus.FINISHED_OK])
+        sessions = [s async for s in flanks_client.connect.list_sessions(query)]
 
         assert len(sessions) == 1
         # Verify query was sent
-        import json
-
-        request_body = json.loads(respx.calls.last.request.content)
+        request_body = json.loads(api_mock.calls.last.request.content)
         assert request_body["query"]["status_in"] == ["Finished:OK"]
 
-    @respx.mock
-    @pytest.mark.asyncio
-    async def test_list_sessions_page(self) -> None:
-        respx.post("https://api.test.flanks.io/v0/token").mock(
-            return_value=httpx.Response(
-                200,
-                json={"access_token": "token", "expires_in": 3600, "token_type": "Bearer"},
-            )
-        )
-
-        respx.post("https://api.test.flanks.io/connect/v2/sessions/list-sessions").mock(
+    async def test_list_sessions_page(
+        self, flanks_client: FlanksClient, api_mock: respx.MockRouter
+    ) -> None:
+        api_mock.post("/connect/v2/sessions/list-sessions").mock(
             return_value=httpx.Response(
                 200,
                 json={
@@ -131,29 +99,17 @@ class TestConnectClient:
             )
         )
 
-        async with FlanksClient(
-            client_id="id",
-            client_secret="secret",
-            base_url="https://api.test.flanks.io",
-        ) as client:
-            page = await client.connect.list_sessions_page()
+        page = await flanks_client.connect.list_sessions_page()
 
         assert isinstance(page, PagedResponse)
         assert len(page.items) == 1
         assert page.next_page_token == "next_token"
         assert page.has_next()
 
-    @respx.mock
-    @pytest.mark.asyncio
-    async def test_create_session(self) -> None:
-        respx.post("https://api.test.flanks.io/v0/token").mock(
-            return_value=httpx.Response(
-                200,
-                json={"access_token": "token", "expires_in": 3600, "token_type": "Bearer"},
-            )
-        )
-
-        respx.post("https://api.test.flanks.io/connect/v2/sessions/create-session").mock(
+    async def test_create_session(
+        self, flanks_client: FlanksClient, api_mock: respx.MockRouter
+    ) -> None:
+        api_mock.post("/connect/v2/sessions/create-session").mock(
             return_value=httpx.Response(
                 200,
                 json={
@@ -165,28 +121,16 @@ class TestConnectClient:
             )
         )
 
-        async with FlanksClient(
-            client_id="id",
-            client_secret="secret",
-            base_url="https://api.test.flanks.io",
-        ) as client:
-            config = SessionConfig(connector_id="conn_123")
-            session = await client.connect.create_session(config)
+        config = SessionConfig(connector_id="conn_123")
+        session = await flanks_client.connect.create_session(config)
 
         assert session.session_id == "new_sess"
         assert session.status == SessionStatus.WAITING_CREDENTIALS
 
-    @respx.mock
-    @pytest.mark.asyncio
-    async def test_list_connectors(self) -> None:
-        respx.post("https://api.test.flanks.io/v0/token").mock(
-            return_value=httpx.Response(
-                200,
-                json={"access_token": "token", "expires_in": 3600, "token_type": "Bearer"},
-            )
-        )
-
-        respx.post("https://api.test.flanks.io/connect/v2/connectors/list-connectors").mock(
+    async def test_list_connectors(
+        self, flanks_client: FlanksClient, api_mock: respx.MockRouter
+    ) -> None:
+        api_mock.post("/connect/v2/connectors/list-connectors").mock(
             return_value=httpx.Response(
                 200,
                 json={
@@ -196,12 +140,7 @@ class TestConnectClient:
             )
         )
 
-        async with FlanksClient(
-            client_id="id",
-            client_secret="secret",
-            base_url="https://api.test.flanks.io",
-        ) as client:
-            connectors = [c async for c in client.connect.list_connectors()]
+        connectors = [c async for c in flanks_client.connect.list_connectors()]
 
         assert len(connectors) == 1
         assert connectors[0].connector_id == "c1"
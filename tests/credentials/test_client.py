@@ -1,8 +1,11 @@
+import asyncio
+import json
+
 import httpx
 import pytest
 import respx
 
-from flanks import FlanksClient
+from flanks import FlanksClient, FlanksNotFoundError
 from flanks.credentials.models import Credential, CredentialsListResponse, CredentialStatus
 
 
@@ -36,17 +39,10 @@ class TestCredentialModels:
 
 
 class TestCredentialsClient:
-    @respx.mock
-    @pytest.mark.asyncio
-    async def test_get_status(self) -> None:
-        respx.post("https://api.test.flanks.io/v0/token").mock(
-            return_value=httpx.Response(
-                200,
-                json={"access_token": "token", "expires_in": 3600, "token_type": "Bearer"},
-            )
-        )
-
-        respx.post("https://api.test.flanks.io/v0/bank/credentials/status").mock(
+    async def test_get_status(
+        self, flanks_client: FlanksClient, api_mock: respx.MockRouter
+    ) -> None:
+        api_mock.post("/v0/bank/credentials/status").mock(
             return_value=httpx.Response(
                 200,
                 json={
@@ -58,27 +54,15 @@ class TestCredentialsClient:
             )
         )
 
-        async with FlanksClient(
-            client_id="id",
-            client_secret="secret",
-            base_url="https://api.test.flanks.io",
-        ) as client:
-            status = await client.credentials.get_status("cred_123")
+        status = await flanks_client.credentials.get_status("cred_123")
 
         assert status.pending is False
         assert status.name == "My Bank"
 
-    @respx.mock
-    @pytest.mark.asyncio
-    async def test_list_credentials(self) -> None:
-        respx.post("https://api.test.flanks.io/v0/token").mock(
-            return_value=httpx.Response(
-                200,
-                json={"access_token": "token", "expires_in": 3600, "token_type": "Bearer"},
-            )
-        )
-
-        respx.post("https://api.test.flanks.io/v0/bank/credentials/list").mock(
+    async def test_list_credentials(
+        self, flanks_client: FlanksClient, api_mock: respx.MockRouter
+    ) -> None:
+        api_mock.post("/v0/bank/credentials/list").mock(
             return_value=httpx.Response(
                 200,
                 json={
@@ -92,12 +76,7 @@ class TestCredentialsClient:
             )
         )
 
-        async with FlanksClient(
-            client_id="id",
-            client_secret="secret",
-            base_url="https://api.test.flanks.io",
-        ) as client:
-            response = await client.credentials.list(page=1)
+        response = await flanks_client.credentials.list(page=1)
 
         assert isinstance(response, CredentialsListResponse)
         assert len(response.items) == 2
@@ -105,123 +84,106 @@ class TestCredentialsClient:
         assert response.page == 1
         assert response.pages == 2
 
-    @respx.mock
-    @pytest.mark.asyncio
-    async def test_force_sca(self) -> None:
-        respx.post("https://api.test.flanks.io/v0/token").mock(
-            return_value=httpx.Response(
+    async def test_list_all_fetches_every_page(
+        self, flanks_client: FlanksClient, api_mock: respx.MockRouter
+    ) -> None:
+        def respond(request: httpx.Request) -> httpx.Response:
+            page = json.loads(request.content)["page"]
+            return httpx.Response(
                 200,
-                json={"access_token": "token", "expires_in": 3600, "token_type": "Bearer"},
+                json={
+                    "items": [{"credentials_token": f"c{page}"}],
+                    "page": page,
+                    "pages": 5,
+                },
             )
-        )
 
-        respx.put("https://api.test.flanks.io/v0/bank/credentials/status").mock(
-            return_value=httpx.Response(
-                200,
-                json={"sca_token": "sca_token_123"},
-            )
+        api_mock.post("/v0/bank/credentials/list").mock(side_effect=respond)
+
+        credentials = await flanks_client.credentials.list_all()
+
+        assert [c.credentials_token for c in credentials] == ["c1", "c2", "c3", "c4", "c5"]
+        requested = sorted(json.loads(call.request.content)["page"] for call in api_mock.calls)
+        assert requested == [1, 2, 3, 4, 5]
+
+    async def test_list_all_bounds_pages_and_cancels_on_error(
+        self, flanks_client: FlanksClient, base_url: str
+    ) -> None:
+        in_flight = peak = 0
+        page_cancelled = asyncio.Event()
+
+        async def respond(request: httpx.Request) -> httpx.Response:
+            nonlocal in_flight, peak
+            page = json.loads(request.content)["page"]
+            in_flight += 1
+            peak = max(peak, in_flight)
+            try:
+                await asyncio.sleep(0)
+                if page == 2:
+                    await asyncio.Event().wait()
+                if page == 5:
+                    return httpx.Response(404, json={"error": "not found"})
+                return httpx.Response(
+                    200,
+                    json={"items": [{"credentials_token": f"c{page}"}], "page": page, "pages": 5},
+                )
+            except asyncio.CancelledError:
+                page_cancelled.set()
+                raise
+            finally:
+                in_flight -= 1
+
+        # The cancelled request is never recorded as a call
+        with respx.mock(base_url=base_url, assert_all_called=False) as api_mock:
+            api_mock.post("/v0/bank/credentials/list").mock(side_effect=respond)
+
+            with pytest.raises(FlanksNotFoundError):
+                await asyncio.wait_for(flanks_client.credentials.list_all(concurrency=2), timeout=1)
+
+        assert page_cancelled.is_set()
+        assert peak == 2
+
+    @pytest.mark.parametrize("concurrency", [0, -1])
+    async def test_list_all_rejects_non_positive_concurrency(
+        self, flanks_client: FlanksClient, concurrency: int
+    ) -> None:
+        with pytest.raises(ValueError, match="concurrency"):
+            await flanks_client.credentials.list_all(concurrency=concurrency)
+
+    @pytest.mark.parametrize(
+        ("method", "force", "token_field"),
+        [
+            ("force_sca", "sca", "sca_token"),
+            ("force_reset", "reset", "reset_token"),
+            ("force_transaction", "transaction", "transaction_token"),
+        ],
+    )
+    async def test_force_actions(
+        self,
+        flanks_client: FlanksClient,
+        api_mock: respx.MockRouter,
+        method: str,
+        force: str,
+        token_field: str,
+    ) -> None:
+        api_mock.put("/v0/bank/credentials/status").mock(
+            return_value=httpx.Response(200, json={token_field: f"{force}_token_123"})
         )
 
-        async with FlanksClient(
-            client_id="id",
-            client_secret="secret",
-            base_url="https://api.test.flanks.io",
-        ) as client:
-            sca_token = await client.credentials.force_sca("cred_123")
+        token = await getattr(flanks_client.credentials, method)("cred_123")
 
-        assert sca_token == "sca_token_123"
+        assert token == f"{force}_token_123"
 
         # Verify request uses 'force' parameter
-        import json
-
-        request_body = json.loads(respx.calls.last.request.content)
-        assert request_body["force"] == "sca"
-        assert request_body["credentials_token"] == "cred_123"
-
-    @respx.mock
-    @pytest.mark.asyncio
-    async def test_force_reset(self) -> None:
-        respx.post("https://api.test.flanks.io/v0/token").mock(
-            return_value=httpx.Response(
-                200,
-                json={"access_token": "token", "expires_in": 3600, "token_type": "Bearer"},
-            )
-        )
-
-        respx.put("https://api.test.flanks.io/v0/bank/credentials/status").mock(
-            return_value=httpx.Response(
-                200,
-                json={"reset_token": "reset_token_123"},
-            )
-        )
-
-        async with FlanksClient(
-            client_id="id",
-            client_secret="secret",
-            base_url="https://api.test.flanks.io",
-        ) as client:
-            reset_token = await client.credentials.force_reset("cred_123")
-
-        assert reset_token == "reset_token_123"
-
-        # Verify request
-        import json
-
-        request_body = json.loads(respx.calls.last.request.content)
-        assert request_body["force"] == "reset"
-
-    @respx.mock
-    @pytest.mark.asyncio
-    async def test_force_transaction(self) -> None:
-        respx.post("https://api.test.flanks.io/v0/token").mock(
-            return_value=httpx.Response(
-                200,
-                json={"access_token": "token", "expires_in": 3600, "token_type": "Bearer"},
-            )
-        )
-
-        respx.put("https://api.test.flanks.io/v0/bank/credentials/status").mock(
-            return_value=httpx.Response(
-                200,
-                json={"transaction_token": "tx_token_123"},
-            )
-        )
-
-        async with FlanksClient(
-            client_id="id",
-            client_secret="secret",
-            base_url="https://api.test.flanks.io",
-        ) as client:
-            tx_token = await client.credentials.force_transaction("cred_123")
-
-        assert tx_token == "tx_token_123"
-
-        # Verify request
-        import json
-
-        request_body = json.loads(respx.calls.last.request.content)
-        assert request_body["force"] == "transaction"
-
-    @respx.mock
-    @pytest.mark.asyncio
-    async def test_delete(self) -> None:
-        respx.post("https://api.test.flanks.io/v0/token").mock(
-            return_value=httpx.Response(
-                200,
-                json={"access_token": "token", "expires_in": 3600, "token_type": "Bearer"},
-            )
-        )
+        request_body = json.loads(api_mock.calls.last.request.content)
+        assert request_body == {"credentials_token": "cred_123", "force": force}
 
-        respx.delete("https://api.test.flanks.io/v0/bank/credentials").mock(
+    async def test_delete(self, flanks_client: FlanksClient, api_mock: respx.MockRouter) -> None:
+        api_mock.delete("/v0/bank/credentials").mock(
             return_value=httpx.Response(200, json={"message": "Successfully deleted"})
         )
 
-        async with FlanksClient(
-            client_id="id",
-            client_secret="secret",
-            base_url="https://api.test.flanks.io",
-        ) as client:
-            await client.credentials.delete("cred_123")
+        await flanks_client.credentials.delete("cred_123")
 
         # Verify DELETE was called
-        assert respx.calls.last.request.method == "DELETE"
+        assert api_mock.calls.last.request.method == "DELETE"
@@ -1,5 +1,4 @@
 import httpx
-import pytest
 import respx
 
 from flanks import FlanksClient
@@ -34,17 +33,10 @@ class TestEntity:
 
 
 class TestEntitiesClient:
-    @respx.mock
-    @pytest.mark.asyncio
-    async def test_list_entities(self) -> None:
-        respx.post("https://api.test.flanks.io/v0/token").mock(
-            return_value=httpx.Response(
-                200,
-                json={"access_token": "token", "expires_in": 3600, "token_type": "Bearer"},
-            )
-        )
-
-        respx.get("https://api.test.flanks.io/v0/bank/available").mock(
+    async def test_list_entities(
+        self, flanks_client: FlanksClient, api_mock: respx.MockRouter
+    ) -> None:
+        api_mock.get("/v0/bank/available").mock(
             return_value=httpx.Response(
                 200,
                 json=[
@@ -54,12 +46,7 @@ class TestEntitiesClient:
             )
         )
 
-        async with FlanksClient(
-            client_id="id",
-            client_secret="secret",
-            base_url="https://api.test.flanks.io",
-        ) as client:
-            entities = await client.entities.list()
+        entities = await flanks_client.entities.list()
 
         assert len(entities) == 2
         assert entities[0].id == "bank_1"
@@ -1,3 +1,5 @@
+import json
+
 import httpx
 import pytest
 import respx
@@ -46,17 +48,10 @@ class TestLinksModels:
 
 
 class TestLinksClient:
-    @respx.mock
-    @pytest.mark.asyncio
-    async def test_list_links(self) -> None:
-        respx.post("https://api.test.flanks.io/v0/token").mock(
-            return_value=httpx.Response(
-                200,
-                json={"access_token": "token", "expires_in": 3600, "token_type": "Bearer"},
-            )
-        )
-
-        respx.post("https://api.test.flanks.io/v0/links/list-links").mock(
+    async def test_list_links(
+        self, flanks_client: FlanksClient, api_mock: respx.MockRouter
+    ) -> None:
+        api_mock.post("/v0/links/list-links").mock(
             return_value=httpx.Response(
                 200,
                 json=[
@@ -66,29 +61,17 @@ class TestLinksClient:
             )
         )
 
-        async with FlanksClient(
-            client_id="id",
-            client_secret="secret",
-            base_url="https://api.test.flanks.io",
-        ) as client:
-            links = await client.links.list()
+        links = await flanks_client.links.list()
 
         assert len(links) == 2
         assert links[0].token == "link1"
         assert links[1].name == "Link Two"
         assert links[1].active is False
 
-    @respx.mock
-    @pytest.mark.asyncio
-    async def test_create_link(self) -> None:
-        respx.post("https://api.test.flanks.io/v0/token").mock(
-            return_value=httpx.Response(
-                200,
-                json={"access_token": "token", "expires_in": 3600, "token_type": "Bearer"},
-            )
-        )
-
-        respx.post("https://api.test.flanks.io/v0/links/create-link").mock(
+    async def test_create_link(
+        self, flanks_client: FlanksClient, api_mock: respx.MockRouter
+    ) -> None:
+        api_mock.post("/v0/links/create-link").mock(
             return_value=httpx.Response(
                 200,
                 json={
@@ -100,139 +83,67 @@ class TestLinksClient:
             )
         )
 
-        async with FlanksClient(
-            client_id="id",
-            client_secret="secret",
-            base_url="https://api.test.flanks.io",
-        ) as client:
-            link = await client.links.create("https://example.com", name="New Link")
+        link = await flanks_client.links.create("https://example.com", name="New Link")
 
         assert link.token == "new_link"
         assert link.name == "New Link"
 
         # Verify request
-        import json
-
-        request_body = json.loads(respx.calls.last.request.content)
+        request_body = json.loads(api_mock.calls.last.request.content)
         assert request_body["redirect_uri"] == "https://example.com"
         assert request_body["name"] == "New Link"
 
-    @respx.mock
-    @pytest.mark.asyncio
-    async def test_edit_link(self) -> None:
-        respx.post("https://api.test.flanks.io/v0/token").mock(
-            return_value=httpx.Response(
-                200,
-                json={"access_token": "token", "expires_in": 3600, "token_type": "Bearer"},
-            )
-        )
-
-        respx.post("https://api.test.flanks.io/v0/links/edit-link").mock(
+    async def test_edit_link(self, flanks_client: FlanksClient, api_mock: respx.MockRouter) -> None:
+        api_mock.post("/v0/links/edit-link").mock(
             return_value=httpx.Response(
                 200,
                 json={"token": "link1", "name": "Updated Link", "active": True},
             )
         )
 
-        async with FlanksClient(
-            client_id="id",
-            client_secret="secret",
-            base_url="https://api.test.flanks.io",
-        ) as client:
-            link = await client.links.edit("link1", name="Updated Link")
+        link = await flanks_client.links.edit("link1", name="Updated Link")
 
         assert link.name == "Updated Link"
 
         # Verify request uses 'token' not 'link_token'
-        import json
-
-        request_body = json.loads(respx.calls.last.request.content)
+        request_body = json.loads(api_mock.calls.last.request.content)
         assert request_body["token"] == "link1"
 
-    @respx.mock
-    @pytest.mark.asyncio
-    async def test_delete_link(self) -> None:
-        respx.post("https://api.test.flanks.io/v0/token").mock(
-            return_value=httpx.Response(
-                200,
-                json={"access_token": "token", "expires_in": 3600, "token_type": "Bearer"},
-            )
-        )
-
-        respx.post("https://api.test.flanks.io/v0/links/delete-link").mock(
+    async def test_delete_link(
+        self, flanks_client: FlanksClient, api_mock: respx.MockRouter
+    ) -> None:
+        api_mock.post("/v0/links/delete-link").mock(
             return_value=httpx.Response(200, json={"token": "link1"})
         )
 
-        async with FlanksClient(
-            client_id="id",
-            client_secret="secret",
-            base_url="https://api.test.flanks.io",
-        ) as client:
-            await client.links.delete("link1")
+        await flanks_client.links.delete("link1")
 
         # Verify request uses 'token'
-        import json
-
-        request_body = json.loads(respx.calls.last.request.content)
+        request_body = json.loads(api_mock.calls.last.request.content)
         assert request_body["token"] == "link1"
 
-    @respx.mock
-    @pytest.mark.asyncio
-    async def test_pause_link(self) -> None:
-        respx.post("https://api.test.flanks.io/v0/token").mock(
-            return_value=httpx.Response(
-                200,
-                json={"access_token": "token", "expires_in": 3600, "token_type": "Bearer"},
-            )
-        )
-
-        respx.post("https://api.test.flanks.io/v0/links/pause-link").mock(
-            return_value=httpx.Response(200, json={"token": "link1", "active": False})
+    @pytest.mark.parametrize(("action", "active"), [("pause", False), ("resume", True)])
+    async def test_pause_and_resume_link(
+        self,
+        flanks_client: FlanksClient,
+        api_mock: respx.MockRouter,
+        action: str,
+        active: bool,
+    ) -> None:
+        api_mock.post(f"/v0/links/{action}-link").mock(
+            return_value=httpx.Response(200, json={"token": "link1", "active": active})
         )
 
-        async with FlanksClient(
-            client_id="id",
-            client_secret="secret",
-            base_url="https://api.test.flanks.io",
-        ) as client:
-            link = await client.links.pause("link1")
+        link = await getattr(flanks_client.links, action)("link1")
 
-        assert link.active is False
-
-    @respx.mock
-    @pytest.mark.asyncio
-    async def test_resume_link(self) -> None:
-        respx.post("https://api.test.flanks.io/v0/token").mock(
-            return_value=httpx.Response(
-                200,
-                json={"access_token": "token", "expires_in": 3600, "token_type": "Bearer"},
-            )
-        )
-
-        respx.post("https://api.test.flanks.io/v0/links/resume-link").mock(
-            return_value=httpx.Response(200, json={"token": "link1", "active": True})
-        )
-
-        async with FlanksClient(
-            client_id="id",
-            client_secret="secret",
-            base_url="https://api.test.flanks.io",
-        ) as client:
-            link = await client.links.resume("link1")
-
-        assert link.active is True
-
-    @respx.mock
-    @pytest.mark.asyncio
-    async def test_get_unused_codes(self) -> None:
-        respx.post("https://api.test.flanks.io/v0/token").mock(
-            return_value=httpx.Response(
-                200,
-                json={"access_token": "token", "expires_in": 3600, "token_type": "Bearer"},
-            )
-        )
+        assert link.active is active
+        request_body = json.loads(api_mock.calls.last.request.content)
+        assert request_body["token"] == "link1"
 
-        respx.get("https://api.test.flanks.io/v0/platform/link").mock(
+    async def test_get_unused_codes(
+        self, flanks_client: FlanksClient, api_mock: respx.MockRouter
+    ) -> None:
+        api_mock.get("/v0/platform/link").mock(
             return_value=httpx.Response(
                 200,
                 json=[
@@ -242,55 +153,30 @@ class TestLinksClient:
             )
         )
 
-        async with FlanksClient(
-            client_id="id",
-            client_secret="secret",
-            base_url="https://api.test.flanks.io",
-        ) as client:
-            codes = await client.links.get_unused_codes("link1")
+        codes = await flanks_client.links.get_unused_codes("link1")
 
         assert len(codes) == 2
         assert codes[0].code == "code1"
 
         # Verify query parameter was sent
-        request = respx.calls.last.request
-        assert "link_token=link1" in str(request.url)
+        request = api_mock.calls.last.request
+        assert request.url.params["link_token"] == "link1"
 
-    @respx.mock
-    @pytest.mark.asyncio
-    async def test_get_unused_codes_no_filter(self) -> None:
+    async def test_get_unused_codes_no_filter(
+        self, flanks_client: FlanksClient, api_mock: respx.MockRouter
+    ) -> None:
         """Test get_unused_codes without link_token filter."""
-        respx.post("https://api.test.flanks.io/v0/token").mock(
-            return_value=httpx.Response(
-                200,
-                json={"access_token": "token", "expires_in": 3600, "token_type": "Bearer"},
-            )
-        )
-
-        respx.get("https://api.test.flanks.io/v0/platform/link").mock(
-            return_value=httpx.Response(200, json=[])
-        )
+        api_mock.get("/v0/platform/link").mock(return_value=httpx.Response(200, json=[]))
 
-        async with FlanksClient(
-            client_id="id",
-            client_secret="secret",
-            base_url="https://api.test.flanks.io",
-        ) as client:
-            codes = await client.links.get_unused_codes()
+        codes = await flanks_client.links.get_unused_codes()
 
         assert codes == []
+        assert "link_token" not in api_mock.calls.last.request.url.params
 
-    @respx.mock
-    @pytest.mark.asyncio
-    async def test_exchange_code(self) -> None:
-        respx.post("https://api.test.flanks.io/v0/token").mock(
-            return_value=httpx.Response(
-                200,
-                json={"access_token": "token", "expires_in": 3600, "token_type": "Bearer"},
-            )
-        )
-
-        respx.post("https://api.test.flanks.io/v0/platform/link").mock(
+    async def test_exchange_code(
+        self, flanks_client: FlanksClient, api_mock: respx.MockRouter
+    ) -> None:
+        api_mock.post("/v0/platform/link").mock(
             return_value=httpx.Response(
                 200,
                 json={
@@ -302,18 +188,11 @@ class TestLinksClient:
             )
         )
 
-        async with FlanksClient(
-            client_id="id",
-            client_secret="secret",
-            base_url="https://api.test.flanks.io",
-        ) as client:
-            result = await client.links.exchange_code("code1")
+        result = await flanks_client.links.exchange_code("code1")
 
         assert result.credentials_token == "cred_token_123"
         assert result.link_token == "link1"
 
         # Verify request
-        import json
-
-        request_body = json.loads(respx.calls.last.request.content)
+        request_body = json.loads(api_mock.calls.last.request.content)
         assert request_body["code"] == "code1"
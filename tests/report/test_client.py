@@ -1,4 +1,5 @@
 import datetime
+import json
 
 import httpx
 import pytest
@@ -31,25 +32,18 @@ class TestReportModels:
         assert report.report_id == 456
         assert report.status == ReportStatus.READY
 
-    def test_all_status_values(self) -> None:
-        for status_val in ["new", "payload", "file", "ready", "fail"]:
-            report = Report.model_validate({"report_id": 1, "status": status_val})
-            assert report.status is not None
-            assert report.status.value == status_val
+    @pytest.mark.parametrize("status_val", ["new", "payload", "file", "ready", "fail"])
+    def test_all_status_values(self, status_val: str) -> None:
+        report = Report.model_validate({"report_id": 1, "status": status_val})
+        assert report.status is not None
+        assert report.status.value == status_val
 
 
 class TestReportClient:
-    @respx.mock
-    @pytest.mark.asyncio
-    async def test_list_templates(self) -> None:
-        respx.post("https://api.test.flanks.io/v0/token").mock(
-            return_value=httpx.Response(
-                200,
-                json={"access_token": "token", "expires_in": 3600, "token_type": "Bearer"},
-            )
-        )
-
-        respx.post("https://api.test.flanks.io/report/v1/list-templates").mock(
+    async def test_list_templates(
+        self, flanks_client: FlanksClient, api_mock: respx.MockRouter
+    ) -> None:
+        api_mock.post("/report/v1/list-templates").mock(
             return_value=httpx.Response(
                 200,
                 json={
@@ -61,28 +55,16 @@ class TestReportClient:
             )
         )
 
-        async with FlanksClient(
-            client_id="id",
-            client_secret="secret",
-            base_url="https://api.test.flanks.io",
-        ) as client:
-            templates = await client.report.list_templates()
+        templates = await flanks_client.report.list_templates()
 
         assert len(templates) == 2
         assert templates[0].template_id == 1
         assert templates[1].name == "Template Two"
 
-    @respx.mock
-    @pytest.mark.asyncio
-    async def test_build_report(self) -> None:
-        respx.post("https://api.test.flanks.io/v0/token").mock(
-            return_value=httpx.Response(
-                200,
-                json={"access_token": "token", "expires_in": 3600, "token_type": "Bearer"},
-            )
-        )
-
-        respx.post("https://api.test.flanks.io/report/v1/build-report").mock(
+    async def test_build_report(
+        self, flanks_client: FlanksClient, api_mock: respx.MockRouter
+    ) -> None:
+        api_mock.post("/report/v1/build-report").mock(
             return_value=httpx.Response(
                 200,
                 json={
@@ -91,26 +73,19 @@ class TestReportClient:
             )
         )
 
-        async with FlanksClient(
-            client_id="id",
-            client_secret="secret",
-            base_url="https://api.test.flanks.io",
-        ) as client:
-            report = await client.report.build_report(
-                template_id=1,
-                query={"connection_id_in": ["conn_123"]},
-                template_attributes={"include_charts": True},
-                language="en",
-                start_date=datetime.date(2024, 1, 1),
-                end_date=datetime.date(2024, 12, 31),
-            )
+        report = await flanks_client.report.build_report(
+            template_id=1,
+            query={"connection_id_in": ["conn_123"]},
+            template_attributes={"include_charts": True},
+            language="en",
+            start_date=datetime.date(2024, 1, 1),
+            end_date=datetime.date(2024, 12, 31),
+        )
 
         assert report.report_id == 789
 
         # Verify request
-        import json
-
-        request_body = json.loads(respx.calls.last.request.content)
+        request_body = json.loads(api_mock.calls.last.request.content)
         assert request_body["template_id"] == 1
         assert request_body["query"] == {"connection_id_in": ["conn_123"]}
         assert request_body["template_attributes"] == {"include_charts": True}
@@ -118,53 +93,32 @@ class TestReportClient:
         assert request_body["start_date"] == "2024-01-01"
         assert request_body["end_date"] == "2024-12-31"
 
-    @respx.mock
-    @pytest.mark.asyncio
-    async def test_build_report_minimal(self) -> None:
+    async def test_build_report_minimal(
+        self, flanks_client: FlanksClient, api_mock: respx.MockRouter
+    ) -> None:
         """Test build_report with only required parameters."""
-        respx.post("https://api.test.flanks.io/v0/token").mock(
-            return_value=httpx.Response(
-                200,
-                json={"access_token": "token", "expires_in": 3600, "token_type": "Bearer"},
-            )
-        )
-
-        respx.post("https://api.test.flanks.io/report/v1/build-report").mock(
+        api_mock.post("/report/v1/build-report").mock(
             return_value=httpx.Response(200, json={"report_id": 100})
         )
 
-        async with FlanksClient(
-            client_id="id",
-            client_secret="secret",
-            base_url="https://api.test.flanks.io",
-        ) as client:
-            report = await client.report.build_report(
-                template_id=1,
-                query={},
-                template_attributes={},
-            )
+        report = await flanks_client.report.build_report(
+            template_id=1,
+            query={},
+            template_attributes={},
+        )
 
         assert report.report_id == 100
 
         # Verify request - should have defaults
-        import json
-
-        request_body = json.loads(respx.calls.last.request.content)
+        request_body = json.loads(api_mock.calls.last.request.content)
         assert request_body["language"] == "en"
         assert "start_date" not in request_body
         assert "end_date" not in request_body
 
-    @respx.mock
-    @pytest.mark.asyncio
-    async def test_get_status(self) -> None:
-        respx.post("https://api.test.flanks.io/v0/token").mock(
-            return_value=httpx.Response(
-                200,
-                json={"access_token": "token", "expires_in": 3600, "token_type": "Bearer"},
-            )
-        )
-
-        respx.post("https://api.test.flanks.io/report/v1/get-report-status").mock(
+    async def test_get_status(
+        self, flanks_client: FlanksClient, api_mock: respx.MockRouter
+    ) -> None:
+        api_mock.post("/report/v1/get-report-status").mock(
             return_value=httpx.Response(
                 200,
                 json={
@@ -175,44 +129,25 @@ class TestReportClient:
             )
         )
 
-        async with FlanksClient(
-            client_id="id",
-            client_secret="secret",
-            base_url="https://api.test.flanks.io",
-        ) as client:
-            report = await client.report.get_status(123)
+        report = await flanks_client.report.get_status(123)
 
         assert report.report_id == 123
         assert report.status == ReportStatus.READY
 
-    @respx.mock
-    @pytest.mark.asyncio
-    async def test_get_content_url(self) -> None:
-        respx.post("https://api.test.flanks.io/v0/token").mock(
-            return_value=httpx.Response(
-                200,
-                json={"access_token": "token", "expires_in": 3600, "token_type": "Bearer"},
-            )
-        )
-
-        respx.post("https://api.test.flanks.io/report/v1/get-report-content").mock(
+    async def test_get_content_url(
+        self, flanks_client: FlanksClient, api_mock: respx.MockRouter
+    ) -> None:
+        api_mock.post("/report/v1/get-report-content").mock(
             return_value=httpx.Response(
                 200,
                 json={"url": "https://example.com/report.pdf"},
             )
         )
 
-        async with FlanksClient(
-            client_id="id",
-            client_secret="secret",
-            base_url="https://api.test.flanks.io",
-        ) as client:
-            url = await client.report.get_content_url(123)
+        url = await flanks_client.report.get_content_url(123)
 
         assert url == "https://example.com/report.pdf"
 
         # Verify request
-        import json
-
-        request_body = json.loads(respx.calls.last.request.content)
+        request_body = json.loads(api_mock.calls.last.request.content)
         assert request_body["report_id"] == 123
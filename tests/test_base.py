@@ -1,10 +1,14 @@
+import asyncio
+import json
+
 import httpx
 import pytest
 import respx
-from pydantic import BaseModel
+from pydantic import BaseModel, ValidationError
 
-from flanks.base import BaseClient
+from flanks.base import BaseClient, _json_validator, _page_validator
 from flanks.connection import FlanksConnection
+from flanks.exceptions import FlanksNotFoundError
 
 
 class Item(BaseModel):
@@ -19,18 +23,50 @@ class TestBaseClient:
         assert client.transport is transport
 
 
-class TestPaginate:
+class TestApiCall:
     @respx.mock
-    @pytest.mark.asyncio
-    async def test_iterates_single_page(self) -> None:
-        transport = FlanksConnection(
-            client_id="id",
-            client_secret="secret",
-            base_url="https://api.test.flanks.io",
+    async def test_validates_list_response(self, transport: FlanksConnection) -> None:
+        respx.post("https://api.test.flanks.io/v0/items").mock(
+            return_value=httpx.Response(
+                200,
+                json=[{"id": 1, "name": "one"}, {"id": "2", "name": "two"}],
+            )
         )
-        transport._access_token = "token"
-        transport._token_expires_at = 9999999999
 
+        client = BaseClient(transport)
+        items = await client.api_call("/v0/items", model=list[Item])
+
+        assert items == [Item(id=1, name="one"), Item(id=2, name="two")]
+
+    @respx.mock
+    async def test_rejects_dict_for_list_model(self, transport: FlanksConnection) -> None:
+        respx.post("https://api.test.flanks.io/v0/items").mock(
+            return_value=httpx.Response(200, json={"id": 1, "name": "one"})
+        )
+
+        client = BaseClient(transport)
+        with pytest.raises(ValidationError):
+            await client.api_call("/v0/items", model=list[Item])
+
+    @respx.mock
+    async def test_api_call_dict_rejects_list_response(self, transport: FlanksConnection) -> None:
+        respx.post("https://api.test.flanks.io/v0/items").mock(
+            return_value=httpx.Response(200, json=[{"id": 1}])
+        )
+
+        client = BaseClient(transport)
+        with pytest.raises(TypeError):
+            await client.api_call_dict("/v0/items")
+
+    def test_resolves_validator_once_per_model(self) -> None:
+        assert _json_validator(list[Item]) is _json_validator(list[Item])
+        assert _json_validator(Item) is _json_validator(Item)
+        assert _page_validator(Item) is _page_validator(Item)
+
+
+class TestPaginate:
+    @respx.mock
+    async def test_iterates_single_page(self, transport: FlanksConnection) -> None:
         respx.post("https://api.test.flanks.io/v0/items").mock(
             return_value=httpx.Response(
                 200,
@@ -49,16 +85,7 @@ class TestPaginate:
         assert items[1].name == "two"
 
     @respx.mock
-    @pytest.mark.asyncio
-    async def test_iterates_multiple_pages(self) -> None:
-        transport = FlanksConnection(
-            client_id="id",
-            client_secret="secret",
-            base_url="https://api.test.flanks.io",
-        )
-        transport._access_token = "token"
-        transport._token_expires_at = 9999999999
-
+    async def test_iterates_multiple_pages(self, transport: FlanksConnection) -> None:
         route = respx.post("https://api.test.flanks.io/v0/items")
         route.side_effect = [
             httpx.Response(
@@ -92,16 +119,30 @@ class TestPaginate:
         assert len(respx.calls) == 3
 
     @respx.mock
-    @pytest.mark.asyncio
-    async def test_passes_body_and_page_token(self) -> None:
-        transport = FlanksConnection(
-            client_id="id",
-            client_secret="secret",
-            base_url="https://api.test.flanks.io",
-        )
-        transport._access_token = "token"
-        transport._token_expires_at = 9999999999
+    async def test_iterates_many_pages_in_order(self, transport: FlanksConnection) -> None:
+        pages = 100
+
+        def respond(request: httpx.Request) -> httpx.Response:
+            token = json.loads(request.content)["page_token"]
+            page = 0 if token is None else int(token)
+            return httpx.Response(
+                200,
+                json={
+                    "items": [{"id": page, "name": f"item {page}"}],
+                    "next_page_token": str(page + 1) if page + 1 < pages else None,
+                },
+            )
+
+        respx.post("https://api.test.flanks.io/v0/items").mock(side_effect=respond)
+
+        client = BaseClient(transport)
+        items = [item async for item in client.iterate_paged("/v0/items", {}, Item)]
+
+        assert [item.id for item in items] == list(range(pages))
+        assert len(respx.calls) == pages
 
+    @respx.mock
+    async def test_passes_body_and_page_token(self, transport: FlanksConnection) -> None:
         route = respx.post("https://api.test.flanks.io/v0/items")
         route.side_effect = [
             httpx.Response(
@@ -119,8 +160,6 @@ class TestPaginate:
         _ = [item async for item in client.iterate_paged("/v0/items", body, Item)]
 
         # Check first request
-        import json
-
         first_request = respx.calls[0].request
         first_body = json.loads(first_request.content)
         assert first_body["filter"] == "active"
@@ -130,3 +169,173 @@ class TestPaginate:
         second_request = respx.calls[1].request
         second_body = json.loads(second_request.content)
         assert second_body["page_token"] == "page2"
+
+    async def test_prefetches_next_page_and_cancels_on_early_exit(
+        self, transport: FlanksConnection, api_mock: respx.MockRouter
+    ) -> None:
+        second_page_requested = asyncio.Event()
+
+        def respond(request: httpx.Request) -> httpx.Response:
+            if json.loads(request.content)["page_token"] is None:
+                return httpx.Response(
+                    200,
+                    json={"items": [{"id": 1, "name": "one"}], "next_page_token": "page2"},
+                )
+            second_page_requested.set()
+            return httpx.Response(
+                200,
+                json={"items": [{"id": 2, "name": "two"}], "next_page_token": "page3"},
+            )
+
+        api_mock.post("/v0/items").mock(side_effect=respond)
+
+        client = BaseClient(transport)
+        items = client.iterate_paged("/v0/items", {}, Item)
+        first = await anext(items)
+        # The consumer holds the first item while the second page is fetched
+        await asyncio.wait_for(second_page_requested.wait(), timeout=1)
+        await items.aclose()
+
+        assert first.id == 1
+        assert len(api_mock.calls) == 2
+
+    async def test_closing_cancels_in_flight_prefetch(
+        self, transport: FlanksConnection, api_mock: respx.MockRouter
+    ) -> None:
+        second_page_started = asyncio.Event()
+        second_page_cancelled = asyncio.Event()
+
+        async def respond(request: httpx.Request) -> httpx.Response:
+            if json.loads(request.content)["page_token"] is None:
+                return httpx.Response(
+                    200,
+                    json={"items": [{"id": 1, "name": "one"}], "next_page_token": "page2"},
+                )
+            second_page_started.set()
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                second_page_cancelled.set()
+                raise
+            raise AssertionError("unreachable")
+
+        api_mock.post("/v0/items").mock(side_effect=respond)
+
+        client = BaseClient(transport)
+        items = client.iterate_paged("/v0/items", {}, Item)
+        await anext(items)
+        await asyncio.wait_for(second_page_started.wait(), timeout=1)
+        await asyncio.wait_for(items.aclose(), timeout=1)
+
+        assert second_page_cancelled.is_set()
+
+
+class TestPaginateMany:
+    @staticmethod
+    def respond(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        item_id = body["query"]["id"]
+        if item_id == 0:
+            return httpx.Response(404, json={"error": "not found"})
+        if body["page_token"] is None:
+            return httpx.Response(
+                200,
+                json={"items": [{"id": item_id, "name": "a"}], "next_page_token": "next"},
+            )
+        return httpx.Response(
+            200,
+            json={"items": [{"id": item_id, "name": "b"}], "next_page_token": None},
+        )
+
+    async def test_yields_every_item_of_every_query(
+        self, transport: FlanksConnection, api_mock: respx.MockRouter
+    ) -> None:
+        api_mock.post("/v0/items").mock(side_effect=self.respond)
+
+        client = BaseClient(transport)
+        bodies = [{"query": {"id": i}} for i in (3, 1, 2, 5, 4)]
+        items = [
+            item async for item in client.iterate_paged_many("/v0/items", bodies, Item, prefetch=2)
+        ]
+
+        assert sorted((item.id, item.name) for item in items) == [
+            (i, name) for i in range(1, 6) for name in ("a", "b")
+        ]
+        assert len(api_mock.calls) == 10
+
+    async def test_limits_concurrent_queries(
+        self, transport: FlanksConnection, api_mock: respx.MockRouter
+    ) -> None:
+        queries_started: list[int] = []
+
+        def respond(request: httpx.Request) -> httpx.Response:
+            body = json.loads(request.content)
+            if body["page_token"] is None:
+                queries_started.append(body["query"]["id"])
+            return self.respond(request)
+
+        api_mock.post("/v0/items").mock(side_effect=respond)
+
+        client = BaseClient(transport)
+        bodies = [{"query": {"id": i}} for i in range(1, 6)]
+        items = client.iterate_paged_many("/v0/items", bodies, Item, prefetch=2, buffer=1)
+        await anext(items)
+        await items.aclose()
+
+        # The consumer stopped after one item, before any query could finish
+        assert sorted(queries_started) == [1, 2]
+
+    async def test_closing_cancels_query_prefetch(
+        self, transport: FlanksConnection, api_mock: respx.MockRouter
+    ) -> None:
+        second_page_started = asyncio.Event()
+        second_page_cancelled = asyncio.Event()
+
+        async def respond(request: httpx.Request) -> httpx.Response:
+            if json.loads(request.content)["page_token"] is None:
+                return httpx.Response(
+                    200,
+                    json={
+                        "items": [{"id": i, "name": "a"} for i in range(3)],
+                        "next_page_token": "next",
+                    },
+                )
+            second_page_started.set()
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                second_page_cancelled.set()
+                raise
+            raise AssertionError("unreachable")
+
+        api_mock.post("/v0/items").mock(side_effect=respond)
+
+        client = BaseClient(transport)
+        items = client.iterate_paged_many("/v0/items", [{"query": {}}], Item, buffer=1)
+        await anext(items)
+        # The producer is now blocked on the full buffer while the next page is fetched
+        await asyncio.wait_for(second_page_started.wait(), timeout=1)
+        await items.aclose()
+
+        # Cancelled before aclose() returns, not left to the generator finalizer
+        assert second_page_cancelled.is_set()
+
+    @pytest.mark.parametrize("option", ["prefetch", "buffer"])
+    async def test_rejects_non_positive_limits(
+        self, transport: FlanksConnection, option: str
+    ) -> None:
+        client = BaseClient(transport)
+        items = client.iterate_paged_many("/v0/items", [{"query": {}}], Item, **{option: 0})
+        with pytest.raises(ValueError, match=option):
+            await anext(items)
+
+    async def test_raises_query_error(
+        self, transport: FlanksConnection, api_mock: respx.MockRouter
+    ) -> None:
+        api_mock.post("/v0/items").mock(side_effect=self.respond)
+
+        client = BaseClient(transport)
+        bodies = [{"query": {"id": i}} for i in (1, 0, 2)]
+        with pytest.raises(FlanksNotFoundError):
+            async for _ in client.iterate_paged_many("/v0/items", bodies, Item):
+                pass
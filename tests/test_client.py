@@ -2,12 +2,19 @@ import os
 from datetime import date
 from unittest.mock import patch
 
+import httpx
 import pytest
 
 from flanks import FlanksClient, FlanksConfigError
 from flanks.connection import FlanksConnection
 
 
+@pytest.fixture
+def client() -> FlanksClient:
+    """Fresh client; function-scoped since tests check its lazily cached transport."""
+    return FlanksClient(client_id="id", client_secret="secret")
+
+
 class TestFlanksClientInit:
     def test_accepts_explicit_credentials(self) -> None:
         client = FlanksClient(client_id="test_id", client_secret="test_secret")
@@ -77,23 +84,21 @@ class TestFlanksClientInit:
 
 
 class TestFlanksClientTransport:
-    def test_transport_is_lazily_created(self) -> None:
-        client = FlanksClient(client_id="id", client_secret="secret")
+    def test_transport_is_lazily_created(self, client: FlanksClient) -> None:
         # Transport not yet created
         assert "transport" not in client.__dict__
 
-    def test_transport_returns_flanks_connection(self) -> None:
-        client = FlanksClient(client_id="id", client_secret="secret")
+    def test_transport_returns_flanks_connection(self, client: FlanksClient) -> None:
         transport = client.transport
         assert isinstance(transport, FlanksConnection)
 
-    def test_transport_is_cached(self) -> None:
-        client = FlanksClient(client_id="id", client_secret="secret")
+    def test_transport_is_cached(self, client: FlanksClient) -> None:
         transport1 = client.transport
         transport2 = client.transport
         assert transport1 is transport2
 
     def test_transport_uses_client_config(self) -> None:
+        mock_transport = httpx.MockTransport(lambda request: httpx.Response(200))
         client = FlanksClient(
             client_id="my_id",
             client_secret="my_secret",
@@ -101,6 +106,14 @@ class TestFlanksClientTransport:
             timeout=45.0,
             retries=2,
             retry_backoff=2.0,
+            retry_cap=8.0,
+            pool_size=20,
+            http2=True,
+            breaker_threshold=3,
+            breaker_cooldown=5.0,
+            max_concurrency=8,
+            http_transport=mock_transport,
+            cache_ttl=2.0,
         )
         transport = client.transport
         assert transport._client_id == "my_id"
@@ -109,24 +122,28 @@ class TestFlanksClientTransport:
         assert transport._timeout == 45.0
         assert transport._retries == 2
         assert transport._retry_backoff == 2.0
+        assert transport._retry_cap == 8.0
+        assert transport._pool_size == 20
+        assert transport._http2 is True
+        assert transport._breaker_threshold == 3
+        assert transport._breaker_cooldown == 5.0
+        assert transport._max_concurrency == 8
+        assert transport._http_transport is mock_transport
+        assert transport._cache_ttl == 2.0
 
 
 class TestFlanksClientContextManager:
-    @pytest.mark.asyncio
     async def test_async_context_manager(self) -> None:
         async with FlanksClient(client_id="id", client_secret="secret") as client:
             assert isinstance(client, FlanksClient)
 
-    @pytest.mark.asyncio
     async def test_context_manager_closes_transport(self) -> None:
         async with FlanksClient(client_id="id", client_secret="secret") as client:
-            _ = client.transport._http  # Force HTTP client creation
+            http = client.transport._http  # Force HTTP client creation
 
-        assert client.transport._http.is_closed
+        assert http.is_closed
 
-    @pytest.mark.asyncio
-    async def test_explicit_close(self) -> None:
-        client = FlanksClient(client_id="id", client_secret="secret")
-        _ = client.transport._http  # Force HTTP client creation
+    async def test_explicit_close(self, client: FlanksClient) -> None:
+        http = client.transport._http  # Force HTTP client creation
         await client.close()
-        assert client.transport._http.is_closed
+        assert http.is_closed
@@ -1,12 +1,17 @@
+import asyncio
+import json
 import time
+from unittest.mock import AsyncMock, patch
 
 import httpx
 import pytest
 import respx
+from pydantic_core import to_json
 
-from flanks.connection import FlanksConnection
+from flanks.connection import TOKEN_TIMEOUT, FlanksConnection
 from flanks.exceptions import (
     FlanksAuthError,
+    FlanksCircuitOpenError,
     FlanksNetworkError,
     FlanksNotFoundError,
     FlanksServerError,
@@ -23,6 +28,8 @@ class TestFlanksConnectionInit:
             timeout=30.0,
             retries=2,
             retry_backoff=0.5,
+            pool_size=10,
+            http2=True,
         )
         assert conn._client_id == "test_id"
         assert conn._client_secret == "test_secret"
@@ -30,6 +37,9 @@ class TestFlanksConnectionInit:
         assert conn._timeout == 30.0
         assert conn._retries == 2
         assert conn._retry_backoff == 0.5
+        assert conn._pool_size == 10
+        assert conn._http2 is True
+        assert conn._max_concurrency == 10
 
     def test_default_values(self) -> None:
         conn = FlanksConnection(client_id="id", client_secret="secret")
@@ -37,6 +47,9 @@ class TestFlanksConnectionInit:
         assert conn._timeout == 60.0
         assert conn._retries == 1
         assert conn._retry_backoff == 1.0
+        assert conn._pool_size == 100
+        assert conn._http2 is False
+        assert conn._max_concurrency == 100
 
     def test_initial_token_state(self) -> None:
         conn = FlanksConnection(client_id="id", client_secret="secret")
@@ -53,16 +66,103 @@ class TestFlanksConnectionHTTP:
         assert http.base_url == httpx.URL("https://api.flanks.io")
         assert http.timeout == httpx.Timeout(60.0)
 
+    def test_http_client_pool_limits(self) -> None:
+        conn = FlanksConnection(client_id="id", client_secret="secret", pool_size=7)
+        with patch("flanks.connection.httpx.AsyncClient", wraps=httpx.AsyncClient) as client:
+            _ = conn._http
+        kwargs = client.call_args.kwargs
+        assert kwargs["limits"] == httpx.Limits(
+            max_connections=7, max_keepalive_connections=7, keepalive_expiry=30.0
+        )
+        assert kwargs["http2"] is False
+
+    def test_http_client_http2(self) -> None:
+        pytest.importorskip("h2")
+        conn = FlanksConnection(client_id="id", client_secret="secret", http2=True)
+        with patch("flanks.connection.httpx.AsyncClient", wraps=httpx.AsyncClient) as client:
+            _ = conn._http
+        assert client.call_args.kwargs["http2"] is True
+
+    async def test_http_client_uses_custom_transport(self) -> None:
+        responses = {
+            ("POST", "/v0/token"): {"access_token": "token", "expires_in": 3600},
+            ("POST", "/v0/test"): {"result": "success"},
+        }
+        seen: list[str] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen.append(request.url.path)
+            return httpx.Response(200, json=responses[(request.method, request.url.path)])
+
+        conn = FlanksConnection(
+            client_id="id",
+            client_secret="secret",
+            base_url="https://api.test.flanks.io",
+            http_transport=httpx.MockTransport(handler),
+        )
+
+        async with conn:
+            result = await conn.api_call("/v0/test", {})
+
+        assert result == {"result": "success"}
+        assert seen == ["/v0/token", "/v0/test"]
+
+    def test_url_joins_base_url_and_is_cached(self) -> None:
+        conn = FlanksConnection(
+            client_id="id", client_secret="secret", base_url="https://api.test.flanks.io/prefix/"
+        )
+        url = conn._url("/v0/test")
+        assert url == httpx.URL("https://api.test.flanks.io/prefix/v0/test")
+        assert conn._url("/v0/test") is url
+
     def test_http_client_cached(self) -> None:
         conn = FlanksConnection(client_id="id", client_secret="secret")
         http1 = conn._http
         http2 = conn._http
         assert http1 is http2
 
+    def test_http_client_recreated_for_new_event_loop(self) -> None:
+        conn = FlanksConnection(client_id="id", client_secret="secret")
+
+        async def get_http() -> httpx.AsyncClient:
+            return conn._http
+
+        def run_on_new_loop() -> httpx.AsyncClient:
+            # Leaves the shared test event loop installed, unlike asyncio.run()
+            loop = asyncio.new_event_loop()
+            try:
+                return loop.run_until_complete(get_http())
+            finally:
+                loop.close()
+
+        first = run_on_new_loop()
+        second = run_on_new_loop()
+        assert first is not second
+
+    def test_stale_client_closed_on_its_own_loop(self) -> None:
+        conn = FlanksConnection(client_id="id", client_secret="secret")
+
+        async def get_http() -> httpx.AsyncClient:
+            return conn._http
+
+        old_loop = asyncio.new_event_loop()
+        new_loop = asyncio.new_event_loop()
+        try:
+            stale = old_loop.run_until_complete(get_http())
+            current = new_loop.run_until_complete(get_http())
+            assert current is not stale
+            assert not stale.is_closed
+            # The close is scheduled on the loop that owns the stale connections
+            old_loop.run_until_complete(asyncio.sleep(0.01))
+            assert stale.is_closed
+            assert not current.is_closed
+        finally:
+            old_loop.close()
+            new_loop.close()
+
 
 class TestTokenRefresh:
     @respx.mock
-    @pytest.mark.asyncio
     async def test_refresh_token_success(self) -> None:
         conn = FlanksConnection(
             client_id="test_id",
@@ -84,11 +184,11 @@ class TestTokenRefresh:
         await conn._refresh_token()
 
         assert conn._access_token == "new_token_123"
-        assert conn._token_expires_at > time.time()
-        assert conn._token_expires_at <= time.time() + 3600
+        assert conn._auth_headers == {"Authorization": "Bearer new_token_123"}
+        assert conn._token_expires_at > time.monotonic()
+        assert conn._token_expires_at <= time.monotonic() + 3600
 
     @respx.mock
-    @pytest.mark.asyncio
     async def test_refresh_token_invalid_credentials(self) -> None:
         conn = FlanksConnection(
             client_id="bad_id",
@@ -105,10 +205,38 @@ class TestTokenRefresh:
 
         assert exc_info.value.status_code == 403
 
+    @respx.mock
+    async def test_refresh_token_retries_server_errors(self) -> None:
+        conn = FlanksConnection(
+            client_id="id",
+            client_secret="secret",
+            base_url="https://api.test.flanks.io",
+            retries=2,
+        )
+
+        route = respx.post("https://api.test.flanks.io/v0/token")
+        route.side_effect = [
+            httpx.ConnectError("Connection refused"),
+            httpx.Response(503, json={"error": "unavailable"}),
+            httpx.Response(200, json={"access_token": "token", "expires_in": 3600}),
+        ]
+
+        with patch("flanks.connection.asyncio.sleep", new_callable=AsyncMock) as sleep:
+            await conn._refresh_token()
+
+        assert conn._access_token == "token"
+        assert sleep.await_count == 2
+        request = route.calls[-1].request
+        assert json.loads(request.content) == {
+            "client_id": "id",
+            "client_secret": "secret",
+            "grant_type": "client_credentials",
+        }
+        assert request.extensions["timeout"]["read"] == TOKEN_TIMEOUT
+
 
 class TestEnsureToken:
     @respx.mock
-    @pytest.mark.asyncio
     async def test_refreshes_when_no_token(self) -> None:
         conn = FlanksConnection(
             client_id="id",
@@ -127,7 +255,6 @@ class TestEnsureToken:
         assert conn._access_token == "token"
 
     @respx.mock
-    @pytest.mark.asyncio
     async def test_refreshes_when_expiring_soon(self) -> None:
         conn = FlanksConnection(
             client_id="id",
@@ -135,7 +262,44 @@ class TestEnsureToken:
             base_url="https://api.test.flanks.io",
         )
         conn._access_token = "old_token"
-        conn._token_expires_at = time.time() + 60  # Expires in 1 minute (< 5 min threshold)
+        conn._token_expires_at = time.monotonic() + 10  # Expires in 10 seconds
+
+        respx.post("https://api.test.flanks.io/v0/token").mock(
+            return_value=httpx.Response(
+                200,
+                json={"access_token": "new_token", "expires_in": 3600, "token_type": "Bearer"},
+            )
+        )
+
+        await conn._ensure_token()
+        assert conn._access_token == "new_token"
+
+    @respx.mock
+    async def test_concurrent_callers_share_one_refresh(self) -> None:
+        conn = FlanksConnection(
+            client_id="id",
+            client_secret="secret",
+            base_url="https://api.test.flanks.io",
+        )
+
+        route = respx.post("https://api.test.flanks.io/v0/token").mock(
+            return_value=httpx.Response(200, json={"access_token": "token", "expires_in": 3600})
+        )
+
+        await asyncio.gather(*(conn._ensure_token() for _ in range(10)))
+
+        assert route.call_count == 1
+        assert conn._access_token == "token"
+
+    @respx.mock
+    async def test_refreshes_in_background_when_stale(self) -> None:
+        conn = FlanksConnection(
+            client_id="id",
+            client_secret="secret",
+            base_url="https://api.test.flanks.io",
+        )
+        conn._access_token = "old_token"
+        conn._token_expires_at = time.monotonic() + 60  # Expires in 1 minute (< 5 min threshold)
 
         respx.post("https://api.test.flanks.io/v0/token").mock(
             return_value=httpx.Response(
@@ -145,10 +309,86 @@ class TestEnsureToken:
         )
 
         await conn._ensure_token()
+        assert conn._access_token == "old_token"  # Caller is not blocked
+
+        assert conn._background_refresh is not None
+        await conn._background_refresh
         assert conn._access_token == "new_token"
 
     @respx.mock
-    @pytest.mark.asyncio
+    async def test_background_refresh_failure_keeps_current_token(self) -> None:
+        conn = FlanksConnection(
+            client_id="id",
+            client_secret="secret",
+            base_url="https://api.test.flanks.io",
+            retries=0,
+        )
+        conn._access_token = "old_token"
+        conn._token_expires_at = time.monotonic() + 60
+
+        respx.post("https://api.test.flanks.io/v0/token").mock(
+            side_effect=httpx.ConnectError("Connection refused")
+        )
+
+        await conn._ensure_token()
+        assert conn._background_refresh is not None
+        await conn._background_refresh
+        assert conn._access_token == "old_token"
+
+    @pytest.mark.parametrize(
+        "response",
+        [
+            httpx.Response(200, json={"expires_in": 3600}),
+            httpx.Response(200, content=b"<html>OK</html>"),
+        ],
+    )
+    async def test_background_refresh_ignores_malformed_token_response(
+        self, api_mock: respx.MockRouter, response: httpx.Response
+    ) -> None:
+        conn = FlanksConnection(
+            client_id="id",
+            client_secret="secret",
+            base_url="https://api.test.flanks.io",
+        )
+        conn._access_token = "old_token"
+        conn._token_expires_at = time.monotonic() + 60
+
+        api_mock.post("/v0/token").mock(return_value=response)
+
+        await conn._ensure_token()
+        assert conn._background_refresh is not None
+        await conn._background_refresh
+        assert conn._access_token == "old_token"
+
+    async def test_background_refresh_skips_token_renewed_meanwhile(
+        self, api_mock: respx.MockRouter
+    ) -> None:
+        conn = FlanksConnection(
+            client_id="id",
+            client_secret="secret",
+            base_url="https://api.test.flanks.io",
+        )
+        conn._access_token = "old_token"
+        conn._token_expires_at = time.monotonic() + 60
+
+        token_route = api_mock.post("/v0/token").mock(
+            return_value=httpx.Response(
+                200,
+                json={"access_token": "new_token", "expires_in": 3600, "token_type": "Bearer"},
+            )
+        )
+
+        await conn._ensure_token()  # Schedules a background refresh
+        background = conn._background_refresh
+        conn._token_expires_at = time.monotonic()  # Expired before it gets to run
+        await conn._ensure_token()  # Blocking refresh
+
+        assert background is not None
+        await background
+        assert conn._access_token == "new_token"
+        assert token_route.call_count == 1
+
+    @respx.mock
     async def test_skips_refresh_when_token_valid(self) -> None:
         conn = FlanksConnection(
             client_id="id",
@@ -156,65 +396,267 @@ class TestEnsureToken:
             base_url="https://api.test.flanks.io",
         )
         conn._access_token = "valid_token"
-        conn._token_expires_at = time.time() + 600  # Expires in 10 minutes
+        conn._token_expires_at = time.monotonic() + 600  # Expires in 10 minutes
 
         # No mock - if it tries to refresh, it will fail
         await conn._ensure_token()
         assert conn._access_token == "valid_token"
 
 
+class TestWarmup:
+    @respx.mock
+    async def test_fetches_token(self) -> None:
+        conn = FlanksConnection(
+            client_id="id",
+            client_secret="secret",
+            base_url="https://api.test.flanks.io",
+        )
+
+        respx.post("https://api.test.flanks.io/v0/token").mock(
+            return_value=httpx.Response(
+                200,
+                json={"access_token": "token", "expires_in": 3600, "token_type": "Bearer"},
+            )
+        )
+
+        await conn.warmup()
+        assert conn._access_token == "token"
+
+    @respx.mock
+    async def test_ignores_network_errors(self) -> None:
+        conn = FlanksConnection(
+            client_id="id",
+            client_secret="secret",
+            base_url="https://api.test.flanks.io",
+        )
+
+        respx.post("https://api.test.flanks.io/v0/token").mock(
+            side_effect=httpx.ConnectError("Connection refused")
+        )
+
+        with patch("flanks.connection.asyncio.sleep", new_callable=AsyncMock):
+            await conn.warmup()
+        assert conn._access_token is None
+
+    @respx.mock
+    async def test_ignores_server_errors(self) -> None:
+        conn = FlanksConnection(
+            client_id="id",
+            client_secret="secret",
+            base_url="https://api.test.flanks.io",
+        )
+
+        respx.post("https://api.test.flanks.io/v0/token").mock(
+            return_value=httpx.Response(503, json={"error": "unavailable"})
+        )
+
+        with patch("flanks.connection.asyncio.sleep", new_callable=AsyncMock):
+            await conn.warmup()
+        assert conn._access_token is None
+
+    @respx.mock
+    async def test_raises_on_invalid_credentials(self) -> None:
+        conn = FlanksConnection(
+            client_id="id",
+            client_secret="wrong",
+            base_url="https://api.test.flanks.io",
+        )
+
+        respx.post("https://api.test.flanks.io/v0/token").mock(
+            return_value=httpx.Response(403, json={"error": "forbidden"})
+        )
+
+        with pytest.raises(FlanksAuthError):
+            await conn.warmup()
+
+
 class TestClose:
-    @pytest.mark.asyncio
     async def test_closes_http_client(self) -> None:
         conn = FlanksConnection(client_id="id", client_secret="secret")
-        _ = conn._http  # Trigger creation
+        http = conn._http  # Trigger creation
+        await conn.close()
+        assert http.is_closed
+        # Reopening uses a fresh client
+        reopened = conn._http
+        assert reopened is not http
+        assert not reopened.is_closed
         await conn.close()
-        assert conn._http.is_closed
 
+    async def test_close_waits_for_cancelled_background_refresh(self, base_url: str) -> None:
+        refresh_started = asyncio.Event()
+
+        async def hang(request: httpx.Request) -> httpx.Response:
+            refresh_started.set()
+            await asyncio.Event().wait()
+            raise AssertionError("unreachable")
 
-class TestAPICall:
-    @respx.mock
-    @pytest.mark.asyncio
-    async def test_successful_post_request(self) -> None:
         conn = FlanksConnection(
             client_id="id",
             client_secret="secret",
             base_url="https://api.test.flanks.io",
         )
-        conn._access_token = "valid_token"
-        conn._token_expires_at = time.time() + 3600
+        conn._access_token = "old_token"
+        conn._token_expires_at = time.monotonic() + 60
+
+        # The cancelled token request is never recorded as a call
+        with respx.mock(base_url=base_url, assert_all_called=False) as api_mock:
+            api_mock.post("/v0/token").mock(side_effect=hang)
+
+            await conn._ensure_token()
+            background = conn._background_refresh
+            await asyncio.wait_for(refresh_started.wait(), timeout=1)
+            await conn.close()
+
+        assert background is not None
+        assert background.cancelled()
+        assert conn._background_refresh is None
+
+    async def test_close_drops_cache_and_circuits(self, api_mock: respx.MockRouter) -> None:
+        conn = FlanksConnection(
+            client_id="id",
+            client_secret="secret",
+            base_url="https://api.test.flanks.io",
+            retries=0,
+            cache_ttl=5.0,
+            breaker_threshold=1,
+        )
+        conn._access_token = "token"
+        conn._token_expires_at = time.monotonic() + 3600
+
+        cached = api_mock.get("/v0/entities").mock(
+            return_value=httpx.Response(200, json=[{"id": 1}])
+        )
+        failing = api_mock.post("/v0/test").mock(
+            return_value=httpx.Response(500, json={"error": "server error"})
+        )
+
+        await conn.api_call("/v0/entities", method="GET")
+        with pytest.raises(FlanksServerError):
+            await conn.api_call("/v0/test", {})
+        with pytest.raises(FlanksCircuitOpenError):
+            await conn.api_call("/v0/test", {})
+        await conn.close()
 
-        respx.post("https://api.test.flanks.io/v0/test/endpoint").mock(
+        await conn.api_call("/v0/entities", method="GET")
+        with pytest.raises(FlanksServerError):
+            await conn.api_call("/v0/test", {})
+        await conn.close()
+
+        assert cached.call_count == 2
+        assert failing.call_count == 2
+
+    async def test_async_context_manager_closes(self) -> None:
+        async with FlanksConnection(client_id="id", client_secret="secret") as conn:
+            http = conn._http
+
+        assert http.is_closed
+
+
+class TestAPICall:
+    async def test_successful_post_request(
+        self, transport: FlanksConnection, api_mock: respx.MockRouter
+    ) -> None:
+        api_mock.post("/v0/test/endpoint").mock(
             return_value=httpx.Response(200, json={"result": "success"})
         )
 
-        result = await conn.api_call("/v0/test/endpoint", {"param": "value"})
+        result = await transport.api_call("/v0/test/endpoint", {"param": "value"})
 
         assert result == {"result": "success"}
-        request = respx.calls.last.request
-        assert request.headers["Authorization"] == "Bearer valid_token"
+        request = api_mock.calls.last.request
+        assert request.headers["Authorization"] == "Bearer token"
+        assert request.headers["Content-Type"] == "application/json"
+        assert request.content == b'{"param":"value"}'
 
-    @respx.mock
-    @pytest.mark.asyncio
-    async def test_successful_get_request(self) -> None:
+    async def test_successful_get_request(
+        self, transport: FlanksConnection, api_mock: respx.MockRouter
+    ) -> None:
+        api_mock.get("/v0/entities").mock(return_value=httpx.Response(200, json=[{"id": 1}]))
+
+        result = await transport.api_call("/v0/entities", method="GET")
+
+        assert result == [{"id": 1}]
+        request = api_mock.calls.last.request
+        assert request.content == b""
+        assert "Content-Type" not in request.headers
+
+    async def test_get_responses_cached_for_ttl(self, api_mock: respx.MockRouter) -> None:
         conn = FlanksConnection(
             client_id="id",
             client_secret="secret",
             base_url="https://api.test.flanks.io",
+            cache_ttl=5.0,
         )
-        conn._access_token = "valid_token"
-        conn._token_expires_at = time.time() + 3600
+        conn._access_token = "token"
+        conn._token_expires_at = time.monotonic() + 3600
 
-        respx.get("https://api.test.flanks.io/v0/entities").mock(
+        route = api_mock.get("/v0/entities").mock(
             return_value=httpx.Response(200, json=[{"id": 1}])
         )
 
-        result = await conn.api_call("/v0/entities", method="GET")
+        assert await conn.api_call("/v0/entities", method="GET") == [{"id": 1}]
+        assert await conn.api_call("/v0/entities", method="GET") == [{"id": 1}]
+        assert route.call_count == 1
 
-        assert result == [{"id": 1}]
+        await conn.api_call("/v0/entities", method="GET", params={"page": 2})
+        assert route.call_count == 2
+
+        with patch("flanks.connection.time.monotonic", return_value=time.monotonic() + 6):
+            await conn.api_call("/v0/entities", method="GET")
+        assert route.call_count == 3
+
+    async def test_get_responses_not_cached_by_default(
+        self, transport: FlanksConnection, api_mock: respx.MockRouter
+    ) -> None:
+        route = api_mock.get("/v0/entities").mock(
+            return_value=httpx.Response(200, json=[{"id": 1}])
+        )
+
+        await transport.api_call("/v0/entities", method="GET")
+        await transport.api_call("/v0/entities", method="GET")
+
+        assert route.call_count == 2
+
+    async def test_api_call_raw_returns_body_bytes(
+        self, transport: FlanksConnection, api_mock: respx.MockRouter
+    ) -> None:
+        api_mock.post("/v0/test").mock(
+            return_value=httpx.Response(200, content=b'{"result": "success"}')
+        )
+
+        result = await transport.api_call_raw("/v0/test", {"param": "value"})
+
+        assert result == b'{"result": "success"}'
+
+    @respx.mock
+    async def test_limits_concurrent_requests(self) -> None:
+        conn = FlanksConnection(
+            client_id="id",
+            client_secret="secret",
+            base_url="https://api.test.flanks.io",
+            max_concurrency=2,
+        )
+        conn._access_token = "valid_token"
+        conn._token_expires_at = time.monotonic() + 3600
+
+        in_flight = 0
+        peak = 0
+
+        async def respond(request: httpx.Request) -> httpx.Response:
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return httpx.Response(200, json={"result": "success"})
+
+        respx.post("https://api.test.flanks.io/v0/test").mock(side_effect=respond)
+
+        await asyncio.gather(*(conn.api_call("/v0/test", {}) for _ in range(6)))
+
+        assert peak == 2
 
     @respx.mock
-    @pytest.mark.asyncio
     async def test_handles_401_with_token_refresh(self) -> None:
         conn = FlanksConnection(
             client_id="id",
@@ -222,7 +664,7 @@ class TestAPICall:
             base_url="https://api.test.flanks.io",
         )
         conn._access_token = "expired_token"
-        conn._token_expires_at = time.time() + 3600  # Looks valid but isn't
+        conn._token_expires_at = time.monotonic() + 3600  # Looks valid but isn't
 
         # First call returns 401
         route = respx.post("https://api.test.flanks.io/v0/test")
@@ -244,24 +686,34 @@ class TestAPICall:
         assert result == {"result": "success"}
         assert conn._access_token == "new_token"
 
-    @respx.mock
-    @pytest.mark.asyncio
-    async def test_raises_auth_error_after_refresh_fails(self) -> None:
-        conn = FlanksConnection(
-            client_id="id",
-            client_secret="secret",
-            base_url="https://api.test.flanks.io",
+    async def test_concurrent_401s_refresh_token_once(
+        self, transport: FlanksConnection, api_mock: respx.MockRouter
+    ) -> None:
+        def respond(request: httpx.Request) -> httpx.Response:
+            if request.headers["Authorization"] == "Bearer token":
+                return httpx.Response(401, json={"error": "invalid token"})
+            return httpx.Response(200, json={"result": "success"})
+
+        api_mock.post("/v0/test").mock(side_effect=respond)
+        token_route = api_mock.post("/v0/token").mock(
+            return_value=httpx.Response(200, json={"access_token": "new_token", "expires_in": 3600})
         )
-        conn._access_token = "bad_token"
-        conn._token_expires_at = time.time() + 3600
 
+        results = await asyncio.gather(*(transport.api_call("/v0/test", {}) for _ in range(5)))
+
+        assert results == [{"result": "success"}] * 5
+        assert token_route.call_count == 1
+
+    async def test_raises_auth_error_after_refresh_fails(
+        self, transport: FlanksConnection, api_mock: respx.MockRouter
+    ) -> None:
         # Both calls return 401
-        respx.post("https://api.test.flanks.io/v0/test").mock(
+        api_mock.post("/v0/test").mock(
             return_value=httpx.Response(401, json={"error": "invalid token"})
         )
 
         # Token refresh succeeds but new token also fails
-        respx.post("https://api.test.flanks.io/v0/token").mock(
+        api_mock.post("/v0/token").mock(
             return_value=httpx.Response(
                 200,
                 json={"access_token": "still_bad", "expires_in": 3600, "token_type": "Bearer"},
@@ -269,51 +721,58 @@ class TestAPICall:
         )
 
         with pytest.raises(FlanksAuthError):
-            await conn.api_call("/v0/test", {"data": "value"})
+            await transport.api_call("/v0/test", {"data": "value"})
 
-    @respx.mock
-    @pytest.mark.asyncio
-    async def test_raises_validation_error_on_400(self) -> None:
+    async def test_fresh_token_rejected_is_not_refreshed_again(
+        self, api_mock: respx.MockRouter
+    ) -> None:
         conn = FlanksConnection(
             client_id="id",
             client_secret="secret",
             base_url="https://api.test.flanks.io",
         )
-        conn._access_token = "token"
-        conn._token_expires_at = time.time() + 3600
+        token_route = api_mock.post("/v0/token").mock(
+            return_value=httpx.Response(
+                200,
+                json={"access_token": "fresh", "expires_in": 3600, "token_type": "Bearer"},
+            )
+        )
+        api_mock.post("/v0/test").mock(
+            return_value=httpx.Response(401, json={"error": "invalid token"})
+        )
 
-        respx.post("https://api.test.flanks.io/v0/test").mock(
+        with pytest.raises(FlanksAuthError):
+            await conn.api_call("/v0/test", {})
+
+        assert token_route.call_count == 1
+        assert len(api_mock.calls) == 2  # Token + one request, no refresh-and-replay
+
+    async def test_raises_validation_error_on_400(
+        self, transport: FlanksConnection, api_mock: respx.MockRouter
+    ) -> None:
+        api_mock.post("/v0/test").mock(
             return_value=httpx.Response(400, json={"error": "validation failed"})
         )
 
         with pytest.raises(FlanksValidationError) as exc_info:
-            await conn.api_call("/v0/test", {"bad": "data"})
+            await transport.api_call("/v0/test", {"bad": "data"})
 
         assert exc_info.value.status_code == 400
         assert exc_info.value.response_body == {"error": "validation failed"}
 
-    @respx.mock
-    @pytest.mark.asyncio
-    async def test_raises_not_found_error_on_404(self) -> None:
-        conn = FlanksConnection(
-            client_id="id",
-            client_secret="secret",
-            base_url="https://api.test.flanks.io",
-        )
-        conn._access_token = "token"
-        conn._token_expires_at = time.time() + 3600
-
-        respx.post("https://api.test.flanks.io/v0/test").mock(
+    async def test_raises_not_found_error_on_404(
+        self, transport: FlanksConnection, api_mock: respx.MockRouter
+    ) -> None:
+        api_mock.post("/v0/test").mock(
             return_value=httpx.Response(404, json={"error": "not found"})
         )
 
         with pytest.raises(FlanksNotFoundError) as exc_info:
-            await conn.api_call("/v0/test", {"id": "missing"})
+            await transport.api_call("/v0/test", {"id": "missing"})
 
         assert exc_info.value.status_code == 404
 
     @respx.mock
-    @pytest.mark.asyncio
     async def test_retries_on_server_error(self) -> None:
         conn = FlanksConnection(
             client_id="id",
@@ -323,7 +782,7 @@ class TestAPICall:
             retry_backoff=0.01,  # Fast for tests
         )
         conn._access_token = "token"
-        conn._token_expires_at = time.time() + 3600
+        conn._token_expires_at = time.monotonic() + 3600
 
         route = respx.post("https://api.test.flanks.io/v0/test")
         route.side_effect = [
@@ -337,8 +796,95 @@ class TestAPICall:
         assert result == {"result": "success"}
         assert len(respx.calls) == 3
 
+    async def test_retries_reuse_encoded_body(
+        self, transport: FlanksConnection, api_mock: respx.MockRouter
+    ) -> None:
+        api_mock.post("/v0/test").mock(
+            side_effect=[
+                httpx.Response(503, json={"error": "unavailable"}),
+                httpx.Response(200, json={"result": "success"}),
+            ]
+        )
+
+        with (
+            patch("flanks.connection.to_json", wraps=to_json) as encode,
+            patch("flanks.connection.asyncio.sleep", new_callable=AsyncMock),
+        ):
+            await transport.api_call("/v0/test", {"data": "value"})
+
+        encode.assert_called_once_with({"data": "value"})
+        assert [call.request.content for call in api_mock.calls] == [b'{"data":"value"}'] * 2
+
+    @respx.mock
+    async def test_retry_backoff_is_jittered(self) -> None:
+        conn = FlanksConnection(
+            client_id="id",
+            client_secret="secret",
+            base_url="https://api.test.flanks.io",
+            retries=3,
+            retry_backoff=1.0,
+        )
+        conn._access_token = "token"
+        conn._token_expires_at = time.monotonic() + 3600
+
+        respx.post("https://api.test.flanks.io/v0/test").mock(
+            return_value=httpx.Response(503, json={"error": "service unavailable"})
+        )
+
+        with (
+            patch("flanks.connection.asyncio.sleep", new_callable=AsyncMock) as sleep,
+            pytest.raises(FlanksServerError),
+        ):
+            await conn.api_call("/v0/test", {})
+
+        delays = [call.args[0] for call in sleep.await_args_list]
+        assert len(delays) == 3
+        for attempt, delay in enumerate(delays):
+            assert 0 <= delay <= 2**attempt
+
+    async def test_retry_backoff_is_capped(self, api_mock: respx.MockRouter) -> None:
+        conn = FlanksConnection(
+            client_id="id",
+            client_secret="secret",
+            base_url="https://api.test.flanks.io",
+            retries=6,
+            retry_backoff=1.0,
+            retry_cap=4.0,
+        )
+        conn._access_token = "token"
+        conn._token_expires_at = time.monotonic() + 3600
+
+        api_mock.post("/v0/test").mock(
+            return_value=httpx.Response(503, json={"error": "service unavailable"})
+        )
+
+        with (
+            patch("flanks.connection.random.uniform", side_effect=lambda a, b: b),
+            patch("flanks.connection.asyncio.sleep", new_callable=AsyncMock) as sleep,
+            pytest.raises(FlanksServerError),
+        ):
+            await conn.api_call("/v0/test", {})
+
+        delays = [call.args[0] for call in sleep.await_args_list]
+        assert delays == [1.0, 2.0, 4.0, 4.0, 4.0, 4.0]
+
+    @pytest.mark.parametrize(("header", "expected"), [("3", 3.0), ("120", 30.0)])
+    async def test_retry_honours_retry_after(
+        self, transport: FlanksConnection, api_mock: respx.MockRouter, header: str, expected: float
+    ) -> None:
+        api_mock.post("/v0/test").mock(
+            side_effect=[
+                httpx.Response(503, json={"error": "busy"}, headers={"Retry-After": header}),
+                httpx.Response(200, json={"result": "success"}),
+            ]
+        )
+
+        with patch("flanks.connection.asyncio.sleep", new_callable=AsyncMock) as sleep:
+            await transport.api_call("/v0/test", {})
+
+        sleep.assert_awaited_once_with(expected)
+
     @respx.mock
-    @pytest.mark.asyncio
     async def test_raises_server_error_after_retries_exhausted(self) -> None:
         conn = FlanksConnection(
             client_id="id",
@@ -348,7 +894,7 @@ class TestAPICall:
             retry_backoff=0.01,
         )
         conn._access_token = "token"
-        conn._token_expires_at = time.time() + 3600
+        conn._token_expires_at = time.monotonic() + 3600
 
         respx.post("https://api.test.flanks.io/v0/test").mock(
             return_value=httpx.Response(503, json={"error": "service unavailable"})
@@ -360,8 +906,21 @@ class TestAPICall:
         assert exc_info.value.status_code == 503
         assert len(respx.calls) == 2  # Initial + 1 retry
 
+    async def test_server_error_with_non_json_body(
+        self, transport: FlanksConnection, api_mock: respx.MockRouter
+    ) -> None:
+        transport._retries = 0
+        api_mock.post("/v0/test").mock(
+            return_value=httpx.Response(502, content=b"<html>Bad Gateway</html>")
+        )
+
+        with pytest.raises(FlanksServerError) as exc_info:
+            await transport.api_call("/v0/test", {})
+
+        assert exc_info.value.status_code == 502
+        assert exc_info.value.response_body == {}
+
     @respx.mock
-    @pytest.mark.asyncio
     async def test_wraps_network_errors(self) -> None:
         conn = FlanksConnection(
             client_id="id",
@@ -370,7 +929,7 @@ class TestAPICall:
             retries=0,
         )
         conn._access_token = "token"
-        conn._token_expires_at = time.time() + 3600
+        conn._token_expires_at = time.monotonic() + 3600
 
         respx.post("https://api.test.flanks.io/v0/test").mock(
             side_effect=httpx.ConnectError("Connection refused")
@@ -380,3 +939,149 @@ class TestAPICall:
             await conn.api_call("/v0/test", {})
 
         assert "Connection refused" in str(exc_info.value)
+
+
+class TestCircuitBreaker:
+    @respx.mock
+    async def test_opens_after_threshold_and_fails_fast(self) -> None:
+        conn = FlanksConnection(
+            client_id="id",
+            client_secret="secret",
+            base_url="https://api.test.flanks.io",
+            retries=0,
+            breaker_threshold=2,
+        )
+        conn._access_token = "token"
+        conn._token_expires_at = time.monotonic() + 3600
+
+        route = respx.post("https://api.test.flanks.io/v0/test").mock(
+            return_value=httpx.Response(503, json={"error": "service unavailable"})
+        )
+
+        for _ in range(2):
+            with pytest.raises(FlanksServerError):
+                await conn.api_call("/v0/test", {})
+
+        with pytest.raises(FlanksCircuitOpenError):
+            await conn.api_call("/v0/test", {})
+
+        assert route.call_count == 2  # Rejected call never reached the server
+
+    @respx.mock
+    async def test_half_open_success_closes_circuit(self) -> None:
+        conn = FlanksConnection(
+            client_id="id",
+            client_secret="secret",
+            base_url="https://api.test.flanks.io",
+            retries=0,
+            breaker_threshold=1,
+            breaker_cooldown=0.0,
+        )
+        conn._access_token = "token"
+        conn._token_expires_at = time.monotonic() + 3600
+
+        route = respx.post("https://api.test.flanks.io/v0/test")
+        route.side_effect = [
+            httpx.Response(500, json={"error": "server error"}),
+            httpx.Response(200, json={"result": "success"}),
+        ]
+
+        with pytest.raises(FlanksServerError):
+            await conn.api_call("/v0/test", {})
+        assert conn._circuits["/v0/test"].opened_at is not None
+
+        result = await conn.api_call("/v0/test", {})
+
+        assert result == {"result": "success"}
+        assert "/v0/test" not in conn._circuits
+
+    @respx.mock
+    async def test_zero_threshold_disables_breaker(self) -> None:
+        conn = FlanksConnection(
+            client_id="id",
+            client_secret="secret",
+            base_url="https://api.test.flanks.io",
+            retries=0,
+            breaker_threshold=0,
+        )
+        conn._access_token = "token"
+        conn._token_expires_at = time.monotonic() + 3600
+
+        respx.post("https://api.test.flanks.io/v0/test").mock(
+            return_value=httpx.Response(500, json={"error": "server error"})
+        )
+
+        for _ in range(10):
+            with pytest.raises(FlanksServerError) as exc_info:
+                await conn.api_call("/v0/test", {})
+            assert not isinstance(exc_info.value, FlanksCircuitOpenError)
+
+    def test_disabled_by_default(self) -> None:
+        conn = FlanksConnection(client_id="id", client_secret="secret")
+        assert conn._breaker_threshold == 0
+
+    async def test_circuit_is_per_path(
+        self, transport: FlanksConnection, api_mock: respx.MockRouter
+    ) -> None:
+        transport._retries = 0
+        transport._breaker_threshold = 1
+        api_mock.post("/v0/failing").mock(
+            return_value=httpx.Response(503, json={"error": "service unavailable"})
+        )
+        api_mock.post("/v0/healthy").mock(return_value=httpx.Response(200, json={"ok": True}))
+
+        with pytest.raises(FlanksServerError):
+            await transport.api_call("/v0/failing", {})
+        with pytest.raises(FlanksCircuitOpenError):
+            await transport.api_call("/v0/failing", {})
+
+        assert await transport.api_call("/v0/healthy", {}) == {"ok": True}
+
+    async def test_network_errors_open_circuit(
+        self, transport: FlanksConnection, api_mock: respx.MockRouter
+    ) -> None:
+        transport._breaker_threshold = 2
+        route = api_mock.post("/v0/test").mock(side_effect=httpx.ConnectError("Connection refused"))
+
+        for _ in range(2):
+            with pytest.raises(FlanksNetworkError):
+                await transport.api_call("/v0/test", {})
+        with pytest.raises(FlanksCircuitOpenError):
+            await transport.api_call("/v0/test", {})
+
+        assert route.call_count == 2
+
+    async def test_half_open_admits_single_probe(
+        self, transport: FlanksConnection, api_mock: respx.MockRouter
+    ) -> None:
+        transport._retries = 0
+        transport._breaker_threshold = 1
+        transport._breaker_cooldown = 0.0
+        failed = False
+        probe_sent = asyncio.Event()
+        release_probe = asyncio.Event()
+
+        async def respond(request: httpx.Request) -> httpx.Response:
+            nonlocal failed
+            if not failed:
+                failed = True
+                return httpx.Response(500, json={"error": "server error"})
+            if not probe_sent.is_set():
+                probe_sent.set()
+                await release_probe.wait()
+                return httpx.Response(200, json={"result": "success"})
+            return httpx.Response(200, json={"result": "late"})
+
+        api_mock.post("/v0/test").mock(side_effect=respond)
+
+        with pytest.raises(FlanksServerError):
+            await transport.api_call("/v0/test", {})
+
+        probe = asyncio.create_task(transport.api_call("/v0/test", {}))
+        await asyncio.wait_for(probe_sent.wait(), timeout=1)
+        with pytest.raises(FlanksCircuitOpenError):
+            await transport.api_call("/v0/test", {})
+
+        release_probe.set()
+        assert await probe == {"result": "success"}
+        assert "/v0/test" not in transport._circuits
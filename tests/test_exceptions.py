@@ -1,6 +1,7 @@
 from flanks import (
     FlanksAPIError,
     FlanksAuthError,
+    FlanksCircuitOpenError,
     FlanksConfigError,
     FlanksError,
     FlanksNetworkError,
@@ -36,6 +37,25 @@ class TestExceptionHierarchy:
         assert error.status_code is None
         assert error.response_body is None
 
+    def test_api_error_decodes_raw_body_on_access(self) -> None:
+        error = FlanksAPIError("bad request", status_code=400, raw_body=b'{"error": "invalid"}')
+        assert error.response_body == {"error": "invalid"}
+
+    def test_api_error_non_json_raw_body(self) -> None:
+        error = FlanksServerError(
+            "bad gateway", status_code=502, raw_body=b"<html>Bad Gateway</html>"
+        )
+        assert error.response_body == {}
+
+    def test_api_error_non_object_raw_body(self) -> None:
+        error = FlanksAPIError("bad request", status_code=400, raw_body=b'["invalid"]')
+        assert error.response_body == {}
+
+    def test_api_error_response_body_assignable(self) -> None:
+        error = FlanksAPIError("bad request", status_code=400, raw_body=b'{"error": "invalid"}')
+        error.response_body = {"error": "replaced"}
+        assert error.response_body == {"error": "replaced"}
+
     def test_auth_error_inherits_from_api_error(self) -> None:
         error = FlanksAuthError("unauthorized", status_code=401)
         assert isinstance(error, FlanksAPIError)
@@ -53,6 +73,11 @@ class TestExceptionHierarchy:
         error = FlanksServerError("server error", status_code=500)
         assert isinstance(error, FlanksAPIError)
 
+    def test_circuit_open_error_inherits_from_server_error(self) -> None:
+        error = FlanksCircuitOpenError("circuit open")
+        assert isinstance(error, FlanksServerError)
+        assert error.status_code is None
+
     def test_network_error_has_cause(self) -> None:
         cause = ConnectionError("connection refused")
         error = FlanksNetworkError("network failure", cause=cause)
@@ -0,0 +1,26 @@
+from typing import Any, cast
+
+import pytest
+from pydantic import BaseModel
+
+from flanks.aggregation_v1.models import Holder, Portfolio
+from flanks.aggregation_v1.models import Transaction as TransactionV1
+from flanks.aggregation_v2.models import Product, ProductType
+from flanks.aggregation_v2.models import Transaction as TransactionV2
+from flanks.base import _Page
+
+
+class TestNestedModels:
+    @pytest.mark.parametrize(
+        "item",
+        [
+            Portfolio(portfolio_id="p1"),
+            Holder(holder_id="h1"),
+            TransactionV1(transaction_id="t1"),
+            Product(product_id="prod_1", product_type=ProductType.ACCOUNT),
+            TransactionV2(transaction_id="tx_1"),
+        ],
+    )
+    def test_nested_instance_is_not_revalidated(self, item: BaseModel) -> None:
+        page = cast(Any, _Page)[type(item)](items=[item])
+        assert page.items[0] is item
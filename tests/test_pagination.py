@@ -1,3 +1,8 @@
+import dataclasses
+from typing import Any, cast
+
+import pytest
+
 from flanks.pagination import PagedResponse
 
 
@@ -22,3 +27,9 @@ class TestPagedResponse:
             next_page_token=None,
         )
         assert response.items == [1, 2, 3]
+
+    def test_is_immutable_and_slotted(self) -> None:
+        response: PagedResponse[int] = PagedResponse(items=[1], next_page_token=None)
+        assert not hasattr(response, "__dict__")
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            cast(Any, response).next_page_token = "token"
@@ -0,0 +1,40 @@
+import datetime
+
+from flanks.base import dump_query
+from flanks.query import BaseQuery
+
+
+class ItemQuery(BaseQuery):
+    id_in: list[int] | None = None
+    date_from: datetime.date | None = None
+
+
+class TestBaseQuery:
+    def test_payload_omits_unset_fields(self) -> None:
+        query = ItemQuery(id_in=[1, 2])
+        assert query.payload == {"id_in": [1, 2]}
+
+    def test_payload_serializes_json_types(self) -> None:
+        query = ItemQuery(date_from=datetime.date(2024, 1, 31))
+        assert query.payload == {"date_from": "2024-01-31"}
+
+    def test_payload_reflects_changes(self) -> None:
+        query = ItemQuery(id_in=[1])
+        assert query.id_in is not None
+        query.id_in.append(2)
+        query.date_from = datetime.date(2024, 1, 31)
+        assert query.payload == {"id_in": [1, 2], "date_from": "2024-01-31"}
+
+    def test_model_copy_has_own_payload(self) -> None:
+        query = ItemQuery(id_in=[1])
+        copied = query.model_copy(update={"id_in": [2]})
+        assert copied.payload == {"id_in": [2]}
+
+
+class TestDumpQuery:
+    def test_none_query_is_empty(self) -> None:
+        assert dump_query(None) == {}
+
+    def test_uses_query_payload(self) -> None:
+        query = ItemQuery(id_in=[1])
+        assert dump_query(query) == {"id_in": [1]}